@@ -1,127 +1,265 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, render_template, jsonify, request, make_response
+from werkzeug.serving import make_server
+from concurrent.futures import ThreadPoolExecutor
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor as SchedulerThreadPool
+import atexit
+import json
 import threading
-import time
 import logging
+import time
 from datetime import datetime
+from types import SimpleNamespace
 import os
+import signal
+
+
+class UTCFormatter(logging.Formatter):
+    """Log formatter with ISO-8601 UTC timestamps, formatted at most once per second"""
+
+    def __init__(self, fmt=None):
+        super().__init__(fmt)
+        self._cached_time = (None, "")
 
-# Import the autoposter functionality
-from autoposter.lambda_function import lambda_handler
+    def formatTime(self, record, datefmt=None):
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if cached_second != second:
+            formatted = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+            self._cached_time = (second, formatted)
+        return formatted
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+
+# Configure logging (operators can raise the threshold with e.g. LOG_LEVEL=WARNING)
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(UTCFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+# (case-insensitive; an unknown level name falls back to INFO instead of failing the boot)
+log_level = logging.getLevelName(os.environ.get("LOG_LEVEL", "INFO").strip().upper())
+logging.basicConfig(level=log_level if isinstance(log_level, int) else logging.INFO, handlers=[log_handler])
 logger = logging.getLogger('social_media_autoposter_app')
 
 app = Flask(__name__)
 
-# Tracking variables for background task
+# Tracking variables for background task (guarded by status_lock)
+status_lock = threading.Lock()
 background_task_status = {
     "running": False,
     "last_run": None,
-    "next_scheduled_run": None,
     "result": None
 }
+# Bumped on every status change, used to build the ETag of / and /status
+status_version = 0
+# (etag, bytes) of the last serialized /status payload
+status_json_cache = (None, b"")
+
+# Daily scheduler (runs the autoposter at noon UTC).  The job runs inline on the
+# scheduler's own worker; one worker is enough since only one run can be active.
+DAILY_JOB_ID = "daily_autopost"
+scheduler = BackgroundScheduler(timezone="UTC", executors={"default": SchedulerThreadPool(max_workers=1)})
+
+# Single worker thread for manual runs (at most one run is ever in progress)
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autoposter")
+
+# Set once the process starts shutting down so no new runs are dispatched
+shutdown_event = threading.Event()
+
+
+def format_timestamp(value):
+    """Format a datetime as 'YYYY-MM-DD HH:MM:SS' (isoformat is much cheaper than strftime)"""
+    return value.replace(tzinfo=None).isoformat(sep=' ', timespec='seconds')
+
+
+def update_status(**fields):
+    """Apply a set of status changes atomically"""
+    global status_version
+
+    with status_lock:
+        background_task_status.update(fields)
+        status_version += 1
+
+
+def claim_run():
+    """Mark the autoposter as running, returning False if a run is already in progress"""
+    global status_version
+
+    with status_lock:
+        if background_task_status["running"]:
+            return False
+        background_task_status["running"] = True
+        status_version += 1
+        return True
 
 
 def run_autoposter():
-    """Background task to run the autoposter script"""
-    global background_task_status
+    """Background task to run the autoposter script (the caller must have claimed the run)"""
+    result = None
 
     try:
         logger.info("Starting autoposter background task")
-        background_task_status["running"] = True
+
+        # Import the autoposter functionality on first use so the web server starts (and
+        # answers /status) without paying for boto3, ffmpeg and the social media clients
+        from autoposter.lambda_function import lambda_handler
 
         # Run the autoposter function (formerly Lambda handler)
         result = lambda_handler(None, None)
-
-        # Update status
-        background_task_status["result"] = result
-        background_task_status["last_run"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"Autoposter task completed with result: {result}")
+        logger.info("Autoposter task completed with result: %s", result)
     except Exception as e:
-        logger.error(f"Error in autoposter task: {e}")
-        background_task_status["result"] = {"statusCode": 500, "body": str(e)}
+        logger.error("Error in autoposter task: %s", e)
+        result = {"statusCode": 500, "body": str(e)}
     finally:
-        background_task_status["running"] = False
+        # Publish the outcome and release the run in a single update
+        update_status(running=False, result=result,
+                      last_run=format_timestamp(datetime.now()))
+
+
+def scheduled_run():
+    """Scheduler entry point, skipped if a manual run is still in progress"""
+    if not claim_run():
+        logger.info("Skipping scheduled run: autoposter is already running")
+        return
+    run_autoposter()
+
+
+def start_scheduler():
+    """Register the daily autoposter job and start the background scheduler"""
+    # A late wakeup (busy worker, clock correction) still fires once within the hour,
+    # and coalesce collapses any backlog of missed runs into a single run
+    scheduler.add_job(scheduled_run, 'cron', hour=12, minute=0, id=DAILY_JOB_ID,
+                      max_instances=1, coalesce=True, misfire_grace_time=3600)
+    scheduler.start()
+    logger.info("Autoposter scheduler started, next run at %s", next_scheduled_run())
+
+
+def shutdown():
+    """Stop dispatching new runs and stop the scheduler and worker pool"""
+    shutdown_event.set()
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    executor.shutdown(wait=False)
+    logger.info("Autoposter scheduler stopped")
+
+
+atexit.register(shutdown)
+
 
+def next_scheduled_run():
+    """Return the next scheduled run time of the daily job, if any"""
+    job = scheduler.get_job(DAILY_JOB_ID)
+    next_run = getattr(job, "next_run_time", None)
+    if not next_run:
+        return None
+    return format_timestamp(next_run)
 
-def schedule_daily_run():
-    """Function to schedule the daily run of the autoposter"""
-    global background_task_status
 
-    while True:
-        # Get current time
-        now = datetime.now()
+def status_snapshot():
+    """Build a consistent copy of the status served by the dashboard and the API"""
+    with status_lock:
+        snapshot = dict(background_task_status)
+    snapshot["next_scheduled_run"] = next_scheduled_run()
+    return snapshot
 
-        # Schedule for noon UTC (or adjust as needed)
-        target_hour = 12
 
-        # Calculate time until next run
-        if now.hour < target_hour:
-            # Run today at noon
-            next_run = now.replace(hour=target_hour, minute=0, second=0, microsecond=0)
-        else:
-            # Run tomorrow at noon
-            import datetime as dt
-            next_run = (now + dt.timedelta(days=1)).replace(hour=target_hour, minute=0, second=0, microsecond=0)
+def status_etag():
+    """ETag identifying the current status (changes on every update and every new schedule)"""
+    with status_lock:
+        version = status_version
+    return f'W/"{version}-{next_scheduled_run()}"'
 
-        # Update next scheduled run in status
-        background_task_status["next_scheduled_run"] = next_run.strftime("%Y-%m-%d %H:%M:%S")
 
-        # Calculate seconds until next run
-        seconds_until_run = (next_run - now).total_seconds()
-        logger.info(f"Next autoposter run scheduled for {next_run.strftime('%Y-%m-%d %H:%M:%S')} "
-                    f"({seconds_until_run / 3600:.2f} hours from now)")
+def status_json(etag):
+    """Serialized status for /status, only re-encoded when the ETag changes"""
+    global status_json_cache
 
-        # Wait until scheduled time
-        time.sleep(seconds_until_run)
+    cached_etag, payload = status_json_cache
+    if cached_etag != etag:
+        payload = json.dumps(status_snapshot()).encode()
+        status_json_cache = (etag, payload)
+    return payload
 
-        # Only proceed if not already running
-        if not background_task_status["running"]:
-            # Start a new thread for the actual run
-            autoposter_thread = threading.Thread(target=run_autoposter)
-            autoposter_thread.daemon = True
-            autoposter_thread.start()
 
-        # Sleep for 60 seconds to avoid busy waiting
-        time.sleep(60)
+def respond_with_etag(build_response):
+    """Answer 304 if the client already has the current status, otherwise build a tagged response"""
+    etag = status_etag()
+    if request.headers.get("If-None-Match") == etag:
+        return "", 304, {"ETag": etag}
+
+    response = make_response(build_response(etag))
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @app.route('/')
 def index():
     """Main status page"""
-    return render_template('index.html', status=background_task_status)
+    # Render from a frozen snapshot; Jinja resolves status.x as a plain attribute lookup
+    return respond_with_etag(
+        lambda etag: render_template('index.html', status=SimpleNamespace(**status_snapshot())))
 
 
 @app.route('/status')
 def status():
     """API endpoint for status"""
-    return jsonify(background_task_status)
+    return respond_with_etag(lambda etag: Response(status_json(etag), mimetype='application/json'))
 
 
 @app.route('/run-now', methods=['POST'])
 def run_now():
     """Endpoint to trigger an immediate run"""
-    if background_task_status["running"]:
-        return jsonify({"status": "error", "message": "Autoposter is already running"})
+    if shutdown_event.is_set():
+        return jsonify({"status": "error", "message": "Autoposter is shutting down"}), 503
+
+    # Check and set the running flag in one step so concurrent requests can't both start a run
+    if not claim_run():
+        return jsonify({"status": "error", "message": "Autoposter is already running"}), 409
 
-    # Start a new thread for the run
-    autoposter_thread = threading.Thread(target=run_autoposter)
-    autoposter_thread.daemon = True
-    autoposter_thread.start()
+    # Hand the run to the worker pool, releasing the claim if the pool was shut down meanwhile
+    try:
+        executor.submit(run_autoposter)
+    except RuntimeError:
+        update_status(running=False)
+        return jsonify({"status": "error", "message": "Autoposter is shutting down"}), 503
 
     return jsonify({"status": "success", "message": "Autoposter started"})
 
 
+# In production the app is served by gunicorn (see Dockerfile), which never runs the
+# __main__ block below.  Only the process with RUN_SCHEDULER=1 owns the scheduler, so
+# gunicorn must run a single worker (use --threads for request concurrency).  Run as a
+# script, the __main__ block decides instead (RUN_SCHEDULER=1 is set for the whole image).
+if __name__ != '__main__' and os.environ.get("RUN_SCHEDULER") == "1":
+    start_scheduler()
+
+
 if __name__ == '__main__':
-    # Start scheduler in a separate thread
-    scheduler_thread = threading.Thread(target=schedule_daily_run)
-    scheduler_thread.daemon = True
-    scheduler_thread.start()
+    # Local development server (FLASK_DEBUG=1 enables the debugger and reloader)
+    debug = os.environ.get("FLASK_DEBUG") == "1"
+
+    # With the reloader on, this module runs in both the file-watcher parent and the
+    # serving child; only the child (WERKZEUG_RUN_MAIN=true) may own the scheduler,
+    # otherwise the job would fire twice a day
+    if (not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true") and not scheduler.running:
+        start_scheduler()
 
     # Set host to 0.0.0.0 to make it accessible externally
     port = int(os.environ.get("PORT", 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
\ No newline at end of file
+
+    if debug:
+        app.run(host='0.0.0.0', port=port, debug=True, threaded=True)
+    else:
+        server = make_server('0.0.0.0', port, app, threaded=True)
+
+        def handle_signal(signum, frame):
+            """Stop accepting runs and requests, then let serve_forever return"""
+            logger.info("Received signal %s, shutting down", signum)
+            shutdown()
+            # server.shutdown() waits for serve_forever to exit, so it can't run on this thread
+            threading.Thread(target=server.shutdown).start()
+
+        signal.signal(signal.SIGTERM, handle_signal)
+        signal.signal(signal.SIGINT, handle_signal)
+        server.serve_forever()
+
+        # Let an in-flight run finish its uploads instead of killing it mid-post
+        executor.shutdown(wait=True)
\ No newline at end of file
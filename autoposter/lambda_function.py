@@ -1,20 +1,35 @@
 import os
+import base64
+import bisect
 import json
 import shutil
 import time
 import datetime
-import textwrap
+import gzip
 import logging
+import threading
+import mimetypes
 import boto3
-import ffmpeg
+import av
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache, wraps
+from importlib.metadata import PackageNotFoundError, version
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import subprocess
+import tempfile
+import uuid
+import random
 import re
+import traceback
+import google.oauth2.credentials
 import googleapiclient.discovery
 import googleapiclient.errors
 from googleapiclient.http import MediaFileUpload
-from instagram_private_api import Client, ClientCompatPatch, ClientError, ClientLoginError
+from instagram_private_api import (Client, ClientCompatPatch, ClientError, ClientLoginError,
+                                   ClientCookieExpiredError, ClientLoginRequiredError)
 
 # Configure logging
 logging.basicConfig(
@@ -29,16 +44,27 @@ LONG_VIDEOS_BUCKET = "longs-clips"  # For long-form content
 SHORTS_REELS_BUCKET = "shorts-clips"  # For shorts and reels content
 CONFIG_BUCKET = "marketing-automation-static"  # For configuration files (using the same static bucket)
 
+# Optional hand-off of posts to EventBridge Scheduler: with the target (this function) and the role
+# the scheduler invokes it with set, every post becomes a one-time schedule instead of a wait in this run
+POST_SCHEDULER_TARGET_ARN = os.environ.get("POST_SCHEDULER_TARGET_ARN")
+POST_SCHEDULER_ROLE_ARN = os.environ.get("POST_SCHEDULER_ROLE_ARN")
+POST_SCHEDULER_GROUP = os.environ.get("POST_SCHEDULER_GROUP", "default")
+POST_SCHEDULER_TIMEZONE = os.environ.get("POST_SCHEDULER_TIMEZONE", "UTC")  # Timezone of the post times
+POST_SCHEDULER_BUCKET = ASSETS_BUCKET  # Rendered videos wait here for their scheduled post
+SCHEDULED_VIDEOS_PREFIX = "scheduled_posts/"
+
 # S3 path configuration
 CONFIG_FILE_KEY = "content_posting_schedule.json"
 TRACKING_FILE_KEY = "posting_tracker.json"
 TITLES_LONG_KEY = "titles.json"
 TITLES_SHORTS_KEY = "titles-shorts.json"
+INSTAGRAM_SESSIONS_PREFIX = "ig_sessions/"  # Saved Instagram login sessions, one file per account
 
 # Local path configuration (for Lambda execution)
 TEMP_DIR = "/tmp/autoposter/temp"
 OUTPUT_DIR = "/tmp/autoposter/output"
 DOWNLOAD_DIR = "/tmp/autoposter/download"
+INSTAGRAM_SETTINGS_DIR = "/tmp/autoposter/instagram"  # Saved login sessions (kept by cleanup)
 
 # Constants for CTA content
 LONG_TEXT_CTAS = {
@@ -70,8 +96,97 @@ REELS_DESC_CTAS = {
 
 LONGS_DESCRIPTION = "Join The Creator's Database for Hundreds of Hidden Gems, Resources, and Priority AI Access: https://thecreatorsdb.com/"
 
-# Initialize AWS S3 client
-s3_client = boto3.client('s3')
+# Maximum number of S3 downloads running at the same time, and the parallel byte-range requests
+# each of them makes
+MAX_PARALLEL_DOWNLOADS = 16
+S3_TRANSFER_CONCURRENCY = 4
+
+# Initialize AWS S3 client (shared by all download threads, so the connection pool holds a
+# connection for every range request of every parallel transfer; connections are kept alive
+# across warm invocations)
+s3_client = boto3.client('s3', config=Config(
+    max_pool_connections=MAX_PARALLEL_DOWNLOADS * S3_TRANSFER_CONCURRENCY,
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    tcp_keepalive=True
+))
+
+# Transfer settings for S3 downloads and uploads (large videos use parallel byte-range GETs and
+# multipart uploads in 8 MiB parts)
+S3_TRANSFER_CONFIG = TransferConfig(
+    max_concurrency=S3_TRANSFER_CONCURRENCY,
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024
+)
+
+# Videos rendered at the same time (each is an ffmpeg process, the Python side only waits on it),
+# and the encoder threads each of them gets so the renders don't oversubscribe the CPUs
+RENDER_WORKERS = max(1, (os.cpu_count() or 1) // 2)
+FFMPEG_THREADS = max(1, (os.cpu_count() or 1) // RENDER_WORKERS)
+
+# libx264 speed/quality trade-off, used when no hardware encoder is available (e.g. X264_PRESET=ultrafast
+# on small CPU-only hosts, at the cost of larger files)
+X264_PRESET = os.environ.get("X264_PRESET", "veryfast")
+X264_CRF = os.environ.get("X264_CRF", "23")
+
+# h264 encoders: ffmpeg output args, and the filter that ends each video filter graph (VAAPI
+# encodes from GPU surfaces, so the frames are uploaded after all CPU filtering is done)
+VAAPI_DEVICE = "/dev/dri/renderD128"
+VIDEO_ENCODERS = {
+    "h264_nvenc": {
+        "args": ('-c:v', 'h264_nvenc', '-preset', 'p4', '-rc', 'vbr', '-cq', '23', '-pix_fmt', 'yuv420p'),
+        "upload_filter": 'null'
+    },
+    "h264_vaapi": {
+        "args": ('-init_hw_device', f'vaapi=va:{VAAPI_DEVICE}', '-filter_hw_device', 'va',
+                 '-c:v', 'h264_vaapi', '-qp', '23'),
+        "upload_filter": 'format=nv12,hwupload'
+    },
+    "libx264": {
+        "args": ('-c:v', 'libx264', '-preset', X264_PRESET, '-crf', X264_CRF, '-pix_fmt', 'yuv420p'),
+        "upload_filter": 'null'
+    }
+}
+
+# Parsed JSON files keyed by (bucket, key), reset at the start of every run
+json_cache = {}
+
+# Loaded fonts keyed by (file name, size), kept across runs (the font files never change)
+font_cache = {}
+
+# Guards tracking_data, which background posts update while the handler keeps processing channels
+tracking_lock = threading.RLock()
+
+# Post status changes are batched into one tracker write every TRACKING_FLUSH_INTERVAL seconds;
+# day and channel progress (needed to resume a run) is always written straight away
+TRACKING_FLUSH_INTERVAL = 10
+tracking_flush = {"last_write": float("-inf")}
+
+# Separator framing the log lines of each post
+LOG_BANNER = "=" * 50
+
+# HTTP statuses of upload failures worth retrying (rate limiting and server errors)
+TRANSIENT_HTTP_STATUSES = {429, 500, 502, 503, 504}
+
+# Resource parts sent with every YouTube upload (the top-level keys of the request body) and the
+# tags marking a Short
+YOUTUBE_UPLOAD_PARTS = "snippet,status"
+YOUTUBE_SHORTS_TAGS = ("#shorts",)
+
+# YouTube uploads go up in resumable chunks of this size
+YOUTUBE_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Posts uploading side by side once their time slot comes (they only wait on the network)
+POST_WORKERS = 8
+post_executor = ThreadPoolExecutor(max_workers=POST_WORKERS, thread_name_prefix="post")
+
+# One upload at a time per YouTube channel / Instagram account (the API clients are not thread-safe)
+upload_locks = {}
+
+# Installed instagram-private-api version, looked up once per process
+try:
+    INSTAGRAM_API_VERSION = version("instagram_private_api")
+except PackageNotFoundError:
+    INSTAGRAM_API_VERSION = None
 
 # Initialize YouTube client (cached for reuse)
 youtube_clients = {}
@@ -91,7 +206,7 @@ def download_file_from_s3(bucket, key, local_path):
     """Download a file from S3 to local storage"""
     try:
         os.makedirs(os.path.dirname(local_path), exist_ok=True)
-        s3_client.download_file(bucket, key, local_path)
+        s3_client.download_file(bucket, key, local_path, Config=S3_TRANSFER_CONFIG)
         logger.info(f"Downloaded {bucket}/{key} to {local_path}")
         return True
     except Exception as e:
@@ -99,10 +214,23 @@ def download_file_from_s3(bucket, key, local_path):
         return False
 
 
+def download_files_from_s3(downloads):
+    """Download several (bucket, key, local_path) files from S3 in parallel"""
+    if not downloads:
+        return []
+
+    # The S3 client is thread-safe, so all workers share it
+    with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_DOWNLOADS, len(downloads))) as executor:
+        return list(executor.map(lambda download: download_file_from_s3(*download), downloads))
+
+
 def upload_file_to_s3(local_path, bucket, key):
     """Upload a file from local storage to S3"""
     try:
-        s3_client.upload_file(local_path, bucket, key)
+        # Store the content type so uploaded videos are served as video/mp4
+        content_type = mimetypes.guess_type(local_path)[0] or "application/octet-stream"
+        s3_client.upload_file(local_path, bucket, key, Config=S3_TRANSFER_CONFIG,
+                              ExtraArgs={"ContentType": content_type})
         logger.info(f"Uploaded {local_path} to {bucket}/{key}")
         return True
     except Exception as e:
@@ -110,43 +238,90 @@ def upload_file_to_s3(local_path, bucket, key):
         return False
 
 
-def load_config_from_s3():
-    """Load the content posting schedule configuration from S3"""
-    config_local_path = os.path.join(DOWNLOAD_DIR, "content_posting_schedule.json")
+def read_file_from_s3(bucket, key):
+    """Read a small S3 object straight into memory"""
+    try:
+        body = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+        logger.info(f"Read {bucket}/{key}")
+        return body
+    except Exception as e:
+        logger.error(f"Error reading {bucket}/{key}: {e}")
+        return None
+
+
+def write_json_to_s3(data, bucket, key, compress=False):
+    """Serialize data as JSON and write it straight to S3 (gzip-compressed and compact if requested)"""
+    try:
+        if compress:
+            body = gzip.compress(json.dumps(data, separators=(',', ':')).encode())
+            extra_args = {"ContentEncoding": "gzip"}
+        else:
+            body = json.dumps(data, indent=4).encode()
+            extra_args = {}
+        s3_client.put_object(Bucket=bucket, Key=key, Body=body, ContentType="application/json", **extra_args)
+        logger.info(f"Wrote {bucket}/{key}")
+        return True
+    except Exception as e:
+        logger.error(f"Error writing {bucket}/{key}: {e}")
+        return False
+
+
+def load_json_from_s3(bucket, key):
+    """Load and parse a JSON file from S3, caching the result for the current run"""
+    cache_key = (bucket, key)
+    if cache_key in json_cache:
+        return json_cache[cache_key]
 
-    if download_file_from_s3(CONFIG_BUCKET, CONFIG_FILE_KEY, config_local_path):
+    # Small JSON files are parsed in memory rather than written to /tmp and re-read
+    data = None
+    body = read_file_from_s3(bucket, key)
+    if body is not None:
         try:
-            with open(config_local_path, 'r') as f:
-                return json.load(f)
+            # Files written compressed start with the gzip magic bytes (S3 doesn't decode them for us)
+            if body[:2] == b'\x1f\x8b':
+                body = gzip.decompress(body)
+            data = json.loads(body)
         except Exception as e:
-            logger.error(f"Error parsing config file: {e}")
-            return None
-    return None
+            logger.error(f"Error parsing {bucket}/{key}: {e}")
+
+    json_cache[cache_key] = data
+    return data
+
+
+def prefetch_json_from_s3():
+    """Fetch the schedule, tracker and title files in parallel at the start of a run"""
+    # Start every run from fresh copies of the files
+    json_cache.clear()
+
+    keys = [CONFIG_FILE_KEY, TRACKING_FILE_KEY, TITLES_LONG_KEY, TITLES_SHORTS_KEY]
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        list(executor.map(lambda key: load_json_from_s3(CONFIG_BUCKET, key), keys))
+
+
+def load_config_from_s3():
+    """Load the content posting schedule configuration from S3"""
+    return load_json_from_s3(CONFIG_BUCKET, CONFIG_FILE_KEY)
 
 
 def load_or_create_tracking_data():
     """Load or create the posting tracker data from S3"""
-    tracking_local_path = os.path.join(DOWNLOAD_DIR, "posting_tracker.json")
-
     try:
-        # Try to download existing tracking file
-        if download_file_from_s3(CONFIG_BUCKET, TRACKING_FILE_KEY, tracking_local_path):
-            with open(tracking_local_path, 'r') as f:
-                return json.load(f)
+        # Try to load the existing tracking file
+        tracking_data = load_json_from_s3(CONFIG_BUCKET, TRACKING_FILE_KEY)
+        if tracking_data is not None:
+            return tracking_data
 
         # If file doesn't exist, create a new tracking structure
         logger.info("No existing tracking data found. Creating new tracking file.")
         tracking_data = {
             "last_processed_day": None,
+            "last_day_index": 0,
             "last_run": None,
             "posts": {}
         }
 
-        # Save and upload the new tracking file
-        with open(tracking_local_path, 'w') as f:
-            json.dump(tracking_data, f, indent=4)
-
-        upload_file_to_s3(tracking_local_path, CONFIG_BUCKET, TRACKING_FILE_KEY)
+        # Upload the new tracking file
+        write_json_to_s3(tracking_data, CONFIG_BUCKET, TRACKING_FILE_KEY, compress=True)
         return tracking_data
 
     except Exception as e:
@@ -154,24 +329,27 @@ def load_or_create_tracking_data():
         # Return a minimal tracking structure in case of error
         return {
             "last_processed_day": None,
+            "last_day_index": 0,
             "last_run": None,
             "posts": {}
         }
 
 
-def update_tracking_data(tracking_data):
-    """Update the tracking data in S3"""
-    tracking_local_path = os.path.join(DOWNLOAD_DIR, "posting_tracker.json")
-
+def update_tracking_data(tracking_data, force=False):
+    """Update the tracking data in S3 (at most every TRACKING_FLUSH_INTERVAL seconds unless forced)"""
     try:
-        # Update the last run timestamp
-        tracking_data["last_run"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # Save and upload the tracking file
-        with open(tracking_local_path, 'w') as f:
-            json.dump(tracking_data, f, indent=4)
-
-        upload_file_to_s3(tracking_local_path, CONFIG_BUCKET, TRACKING_FILE_KEY)
+        with tracking_lock:
+            # Update the last run timestamp
+            tracking_data["last_run"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # Changes made in between go out with the next write (the run ends with a forced one)
+            if not force and time.monotonic() - tracking_flush["last_write"] < TRACKING_FLUSH_INTERVAL:
+                return True
+
+            # Upload the tracking file
+            if not write_json_to_s3(tracking_data, CONFIG_BUCKET, TRACKING_FILE_KEY, compress=True):
+                return False
+            tracking_flush["last_write"] = time.monotonic()
         logger.info("Updated tracking data in S3")
         return True
     except Exception as e:
@@ -199,71 +377,129 @@ def determine_processing_day(tracking_data, config):
     # If this is the first run, start with day1
     if not tracking_data.get("last_processed_day"):
         tracking_data["last_processed_day"] = today
+        tracking_data["last_day_index"] = 1
         return "day1"
 
-    # Find the last processed day and determine the next one
-    last_day = None
-    for channel_id, post_data in tracking_data.get("posts", {}).items():
-        for post in post_data:
-            if "day" in post and (not last_day or post["day"] > last_day):
-                last_day = post["day"]
+    # Move on to the day after the last processed one
+    next_day_index = last_day_index(tracking_data) + 1
+    if f"day{next_day_index}" not in day_keys:
+        # If we've reached the end, cycle back to day1
+        logger.info(f"Reached the end of scheduled days. Cycling back to day1.")
+        next_day_index = 1
 
-    if not last_day:
-        # No previous posts found, start with day1
-        tracking_data["last_processed_day"] = today
-        return "day1"
+    tracking_data["last_processed_day"] = today
+    tracking_data["last_day_index"] = next_day_index
+    return f"day{next_day_index}"
 
-    # Extract day number and increment
-    try:
-        day_num = int(last_day.replace("day", ""))
-        next_day = f"day{day_num + 1}"
 
-        # Check if the next day exists in the config
-        if next_day in day_keys:
-            tracking_data["last_processed_day"] = today
-            return next_day
-        else:
-            # If we've reached the end, cycle back to day1
-            logger.info(f"Reached the end of scheduled days. Cycling back to day1.")
-            tracking_data["last_processed_day"] = today
-            return "day1"
+def last_day_index(tracking_data):
+    """Return the number of the last processed day (0 if no day was processed yet)"""
+    if "last_day_index" in tracking_data:
+        return tracking_data["last_day_index"]
+
+    # Trackers written before last_day_index existed recorded the last finished day as last_processed_key
+    last_key = str(tracking_data.get("last_processed_key") or "")
+    if last_key.startswith("day") and last_key[3:].isdigit():
+        return int(last_key[3:])
+
+    # Older still: take the highest day recorded on a post, comparing the day numbers (as strings
+    # "day10" would sort before "day9")
+    day_numbers = [
+        int(post["day"][3:])
+        for posts in tracking_data.get("posts", {}).values()
+        for post in posts
+        if str(post.get("day", "")).startswith("day") and post["day"][3:].isdigit()
+    ]
+    return max(day_numbers, default=0)
 
-    except (ValueError, AttributeError):
-        logger.error(f"Error determining next day from {last_day}")
-        tracking_data["last_processed_day"] = today
-        return "day1"
 
 def load_titles(is_short=False):
     """Load titles from S3 JSON files"""
     key = TITLES_SHORTS_KEY if is_short else TITLES_LONG_KEY
-    local_path = os.path.join(DOWNLOAD_DIR, os.path.basename(key))
-
-    if download_file_from_s3(CONFIG_BUCKET, key, local_path):
-        try:
-            with open(local_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Error loading titles from {key}: {e}")
-            return {}
-    return {}
+    return load_json_from_s3(CONFIG_BUCKET, key) or {}
 
 
 def get_video_info(file_path):
     """Get video information using ffprobe"""
     try:
-        probe = ffmpeg.probe(file_path)
-        video_stream = next((stream for stream in probe['streams'] if stream['codec_type'] == 'video'), None)
-        if video_stream:
-            width = int(video_stream['width'])
-            height = int(video_stream['height'])
-            duration = float(probe['format']['duration'])
-            return width, height, duration
-        return None, None, None
+        # The file's mtime and size are part of the cache key, so rewritten files are probed again
+        stat = os.stat(file_path)
+        return probe_video(file_path, stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         logger.error(f"Error getting video info: {e}")
         return None, None, None
 
 
+@lru_cache(maxsize=128)
+def probe_video(file_path, mtime_ns, size):
+    """Return (width, height, duration) of a video file, read in-process with PyAV (no ffprobe spawn)"""
+    with av.open(file_path) as container:
+        if not container.streams.video:
+            return None, None, None
+        video_stream = container.streams.video[0]
+
+        # Container duration (as ffprobe's format=duration), else the video stream's own
+        if container.duration:
+            duration = container.duration / av.time_base
+        else:
+            duration = float(video_stream.duration * video_stream.time_base)
+
+        return video_stream.codec_context.width, video_stream.codec_context.height, duration
+
+
+def run_ffmpeg(cmd, input=None):
+    """Run an ffmpeg command, logging the end of its output if it fails"""
+    # Only errors are written: no banner, stream dump or per-frame progress lines
+    cmd = [cmd[0], '-hide_banner', '-loglevel', 'error', '-nostats', *cmd[1:]]
+
+    # stderr goes to an unbuffered temp file rather than a pipe, so it can never block
+    # ffmpeg; it is only read on failure
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            subprocess.run(cmd, input=input, check=True, stdout=subprocess.DEVNULL, stderr=stderr_file,
+                           stdin=None if input is not None else subprocess.DEVNULL)
+        except subprocess.CalledProcessError:
+            stderr_file.seek(0)
+            output = stderr_file.read().decode(errors='replace').strip()
+            logger.error(f"ffmpeg failed: {output[-2000:]}")
+            raise
+
+
+@lru_cache(maxsize=None)
+def video_encoder():
+    """Pick the h264 encoder: NVENC or VAAPI when the hardware is usable, otherwise libx264"""
+    # ffmpeg builds often list hardware encoders without a device to run them, so try a tiny encode
+    for name in ("h264_nvenc", "h264_vaapi"):
+        probe_cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-f', 'lavfi', '-i', 'color=size=256x256:duration=0.1',
+            '-vf', VIDEO_ENCODERS[name]["upload_filter"],
+            *VIDEO_ENCODERS[name]["args"],
+            '-f', 'null', '-'
+        ]
+        try:
+            subprocess.run(probe_cmd, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=30)
+            logger.info(f"Using {name} hardware video encoder")
+            return name
+        except Exception:
+            pass
+
+    logger.info("No hardware video encoder available, using libx264")
+    return "libx264"
+
+
+def video_encoder_args():
+    """Return the ffmpeg output arguments for the selected video encoder"""
+    # Concurrent renders share the CPUs, so each encoder gets its share of threads
+    return (*VIDEO_ENCODERS[video_encoder()]["args"], '-threads', str(FFMPEG_THREADS))
+
+
+def video_upload_filter():
+    """Return the filter that ends every video filter graph (hands the frames to VAAPI, else a no-op)"""
+    return VIDEO_ENCODERS[video_encoder()]["upload_filter"]
+
+
 def format_title_into_two_lines(title, max_chars_per_line=25):
     """Split a title into two balanced lines for better visual presentation"""
     # If title already has line breaks, return as is
@@ -280,102 +516,61 @@ def format_title_into_two_lines(title, max_chars_per_line=25):
     if len(words) <= 2:
         return title
 
-    # Find the middle point to split
-    total_chars = len(title)
-    middle_char_index = total_chars // 2
-
-    # Find the best word break point closest to the middle
-    best_split_index = 0
-    current_length = 0
-
-    for i, word in enumerate(words):
-        current_length += len(word) + (1 if i > 0 else 0)  # Add space except for first word
-
-        # If we've passed the middle point, this might be a good place to break
-        if current_length >= middle_char_index:
-            best_split_index = i
-            break
+    # Length of the first line when splitting before word k is prefix[k] - 1 (words plus spaces)
+    prefix = [0]
+    for word in words:
+        prefix.append(prefix[-1] + len(word) + 1)
 
-    # Make sure we don't split too early
-    if best_split_index == 0 and len(words) > 1:
-        best_split_index = 1
+    # The lines are balanced when prefix[k] is at the middle of the title; check the word
+    # breaks on either side of it and keep whichever gives the smaller length difference
+    middle = prefix[-1] / 2
+    closest = bisect.bisect_left(prefix, middle)
+    candidates = {min(max(k, 1), len(words) - 1) for k in (closest - 1, closest)}
+    best_split_index = min(candidates, key=lambda k: (abs(prefix[k] - middle), k))
 
     # Create the two lines
     first_line = ' '.join(words[:best_split_index])
     second_line = ' '.join(words[best_split_index:])
 
-    # If the split is very unbalanced, try to move a word between lines
-    if abs(len(first_line) - len(second_line)) > 10 and len(words) > 2:
-        if len(first_line) > len(second_line) and best_split_index > 1:
-            best_split_index -= 1
-        elif len(second_line) > len(first_line) and best_split_index < len(words) - 1:
-            best_split_index += 1
-
-        # Recalculate with new split point
-        first_line = ' '.join(words[:best_split_index])
-        second_line = ' '.join(words[best_split_index:])
-
     return f"{first_line}\n{second_line}"
 
 
-def create_text_overlay(text, width, height, font_size=100, position="bottom", padding=20,
-                        bg_color=(0, 0, 0, 180), text_color=(255, 255, 255, 255)):
-    """Create a text overlay for videos"""
-    # Create transparent image
-    overlay = Image.new('RGBA', (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-
-    try:
-        # Try to load the appropriate font
-        font_path = os.path.join(DOWNLOAD_DIR, "fonts", "Poppins.ttf")
+def get_font(font_name, font_size):
+    """Return a downloaded font at the given size, loading each font file and size only once"""
+    key = (font_name, font_size)
+    font = font_cache.get(key)
+    if font is None:
+        font_path = os.path.join(DOWNLOAD_DIR, "fonts", font_name)
         if os.path.exists(font_path):
             font = ImageFont.truetype(font_path, font_size)
         else:
+            # Cached as well, so the warning is logged once rather than for every clip
+            # (download_fonts_and_assets drops the fallbacks once the fonts are downloaded)
+            logger.warning(f"Font {font_name} not available, using the default font")
             font = ImageFont.load_default()
-    except:
-        font = ImageFont.load_default()
-
-    # Wrap text to fit width
-    avg_char_width = font_size * 0.6  # Approximation
-    chars_per_line = int((width - 2 * padding) / avg_char_width)
-    wrapped_text = textwrap.fill(text, width=chars_per_line)
-
-    # Calculate text dimensions
-    text_bbox = draw.textbbox((0, 0), wrapped_text, font=font)
-    text_width = text_bbox[2] - text_bbox[0]
-    text_height = text_bbox[3] - text_bbox[1]
-
-    # Make the rectangle wider (90% of width)
-    rect_width = int(width * 0.9)  # Use 90% of the width
-    rect_x = (width - rect_width) // 2  # Center horizontally
+        font_cache[key] = font
+    return font
 
-    # Calculate vertical position
-    if position == "top":
-        rect_y = padding
-    elif position == "bottom":
-        rect_y = height - text_height - padding - 40  # Extra padding at bottom
-    else:  # center
-        rect_y = (height - text_height) // 2
 
-    # Make the text box taller with more padding
-    rect_height = text_height + (padding * 2)  # More padding for height
+def text_block_layout(text, font, line_gap):
+    """Measure multi-line text: ([(line, width, height)], widest line width, block height including gaps)"""
+    lines = []
+    for line in text.split('\n'):
+        # Advance width and ink height straight from the font (no drawing context involved)
+        line_top, line_bottom = font.getbbox(line)[1::2]
+        lines.append((line, int(font.getlength(line)), line_bottom - line_top))
 
-    # Draw rectangle background with rounded corners
-    draw.rectangle([(rect_x, rect_y), (rect_x + rect_width, rect_y + rect_height)],
-                   fill=bg_color)
+    max_width = max(width for _, width, _ in lines)
+    block_height = sum(height for _, _, height in lines) + line_gap * (len(lines) - 1)
+    return lines, max_width, block_height
 
-    # Draw text
-    text_x = (width - text_width) // 2
-    text_y = rect_y + (rect_height - text_height) // 2  # Center text vertically in box
-    draw.text((text_x, text_y), wrapped_text, font=font, fill=text_color)
 
-    return overlay
-
-
-def create_text_image(text, width, height, font_size=40, position="bottom"):
-    """Create a text image and save it as PNG for ffmpeg"""
-    overlay = create_text_overlay(text, width, height, font_size, position)
-    return overlay
+@lru_cache(maxsize=32)
+def rounded_box(width, height, corner_radius, fill):
+    """Return a rounded rectangle image, shared between clips (only ever pasted, never drawn on)"""
+    box = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    ImageDraw.Draw(box).rounded_rectangle([(0, 0), (width - 1, height - 1)], radius=corner_radius, fill=fill)
+    return box
 
 
 def extract_creator_name(clip_id):
@@ -383,60 +578,107 @@ def extract_creator_name(clip_id):
     if not clip_id or '-' not in clip_id:
         return "Creator"
 
-    parts = clip_id.split('-')
-    if len(parts) < 2:
-        return "Creator"
-
-    # Handle multi-word creator names
-    creator_parts = parts[:-1]  # Everything before the last part
-    return " ".join(creator_parts)
+    # Everything before the last dash is the name (multi-word names are dash-separated)
+    creator_name, _, _ = clip_id.rpartition('-')
+    return creator_name.replace('-', ' ') if creator_name else "Creator"
 
 
-def download_fonts_and_assets():
-    """Download necessary fonts and assets from S3"""
-    # Create fonts directory
+def download_fonts_and_assets(video_cta_types=None, music_tracks=None, clips=()):
+    """Download necessary fonts and assets from S3 (all CTA videos and music tracks unless given), plus clips"""
     fonts_dir = os.path.join(DOWNLOAD_DIR, "fonts")
-    os.makedirs(fonts_dir, exist_ok=True)
+    cta_dir = os.path.join(DOWNLOAD_DIR, "cta_videos")
+    music_dir = os.path.join(DOWNLOAD_DIR, "music")
 
-    # Download fonts
+    # Fonts
     font_files = ["Poppins.ttf", "Poppins-Bold.ttf"]
-    for font in font_files:
-        font_key = f"fonts/{font}"
-        font_path = os.path.join(fonts_dir, font)
-        download_file_from_s3(ASSETS_BUCKET, font_key, font_path)
+    downloads = [(ASSETS_BUCKET, f"fonts/{font}", os.path.join(fonts_dir, font)) for font in font_files]
 
-    # Create CTA videos directory
-    cta_dir = os.path.join(DOWNLOAD_DIR, "cta_videos")
-    os.makedirs(cta_dir, exist_ok=True)
+    # CTA videos
+    if video_cta_types is None:
+        cta_videos = list(LONG_VIDEO_CTAS.values())
+    else:
+        cta_videos = [LONG_VIDEO_CTAS[cta_type] for cta_type in video_cta_types if cta_type in LONG_VIDEO_CTAS]
+    downloads += [(ASSETS_BUCKET, f"cta_videos/{cta_video}", os.path.join(cta_dir, cta_video))
+                  for cta_video in cta_videos]
 
-    # Download CTA videos
-    for cta_video in LONG_VIDEO_CTAS.values():
-        cta_key = f"cta_videos/{cta_video}"
-        cta_path = os.path.join(cta_dir, cta_video)
-        download_file_from_s3(ASSETS_BUCKET, cta_key, cta_path)
+    # Music tracks (by default the standard tracks)
+    if music_tracks is None:
+        music_files = ["track1.mp3", "track2.mp3", "track3.mp3"]
+    else:
+        music_files = [f"{track}.mp3" for track in music_tracks]
+    downloads += [(ASSETS_BUCKET, f"music/{track}", os.path.join(music_dir, track)) for track in music_files]
 
-    # Create music directory
-    music_dir = os.path.join(DOWNLOAD_DIR, "music")
-    os.makedirs(music_dir, exist_ok=True)
+    # Clips to render, fetched up front along with everything else
+    downloads += clips
 
-    # Download default music tracks (assuming there are standard tracks)
-    music_tracks = ["track1.mp3", "track2.mp3", "track3.mp3"]
-    for track in music_tracks:
-        track_key = f"music/{track}"
-        track_path = os.path.join(music_dir, track)
-        download_file_from_s3(ASSETS_BUCKET, track_key, track_path)
+    # Fetch everything concurrently instead of one round trip after another
+    download_files_from_s3(downloads)
 
+    # Check the fonts once up front instead of finding out clip by clip
+    missing_fonts = [font for font in font_files if not os.path.exists(os.path.join(fonts_dir, font))]
+    if missing_fonts:
+        logger.error(f"Fonts missing after download, text will be drawn with the default font: {missing_fonts}")
 
-def download_clip(clip_id, is_short=False):
-    """Download a clip from the appropriate S3 bucket"""
+    # Forget default-font fallbacks from earlier runs so fonts downloaded since then are used
+    for key in [key for key, font in font_cache.items() if not isinstance(font, ImageFont.FreeTypeFont)]:
+        del font_cache[key]
+
+
+def assets_for_day(config, day_key, channels):
+    """Collect the end CTA video types and music tracks the given channels/accounts use on a day"""
+    video_cta_types = set()
+    music_tracks = set()
+
+    for channel in channels:
+        if channel.startswith("instagram_"):
+            account_data = config.get("instagramAccounts", {}).get(channel.replace("instagram_", ""), {})
+            posts = account_data.get(day_key, {}).get("reels", [])
+        else:
+            day_data = config.get("youtubeChannels", {}).get(channel, {}).get(day_key, {})
+            posts = day_data.get("shorts", [])
+
+            # Only long videos get an end CTA video
+            video_cta = day_data.get("long", {}).get("videoCTA")
+            if video_cta:
+                video_cta_types.add(video_cta)
+
+        music_tracks.update(post["musicTrack"] for post in posts if post.get("musicTrack"))
+
+    return video_cta_types, music_tracks
+
+
+def clips_for_day(config, day_key, channels):
+    """Collect the (bucket, key, local_path) downloads of the clips the given channels/accounts use on a day"""
+    clips = set()
+
+    for channel in channels:
+        if channel.startswith("instagram_"):
+            account_data = config.get("instagramAccounts", {}).get(channel.replace("instagram_", ""), {})
+            clips.update((reel["clip"], True) for reel in account_data.get(day_key, {}).get("reels", [])
+                         if reel.get("clip"))
+        else:
+            day_data = config.get("youtubeChannels", {}).get(channel, {}).get(day_key, {})
+            clips.update((short["clip"], True) for short in day_data.get("shorts", []) if short.get("clip"))
+            if day_data.get("long", {}).get("clip"):
+                clips.add((day_data["long"]["clip"], False))
+
+    return [clip_download(clip_id, is_short) for clip_id, is_short in sorted(clips)]
+
+
+def clip_download(clip_id, is_short=False):
+    """Return the (bucket, key, local_path) download of a clip"""
     bucket = SHORTS_REELS_BUCKET if is_short else LONG_VIDEOS_BUCKET
-    key = f"{clip_id}.mp4"
+    local_path = os.path.join(DOWNLOAD_DIR, "shorts" if is_short else "longs", f"{clip_id}.mp4")
+    return bucket, f"{clip_id}.mp4", local_path
+
 
-    # Create the local directory for clips
-    clips_dir = os.path.join(DOWNLOAD_DIR, "shorts" if is_short else "longs")
-    os.makedirs(clips_dir, exist_ok=True)
+def download_clip(clip_id, is_short=False):
+    """Download a clip from the appropriate S3 bucket (unless it was already prefetched)"""
+    bucket, key, local_path = clip_download(clip_id, is_short)
 
-    local_path = os.path.join(clips_dir, f"{clip_id}.mp4")
+    # boto3 only moves a download into place once it is complete, so an existing file is whole
+    if os.path.exists(local_path):
+        return local_path
 
     # Download the clip
     success = download_file_from_s3(bucket, key, local_path)
@@ -448,46 +690,23 @@ def download_clip(clip_id, is_short=False):
     return local_path
 
 
-def add_music_to_video(video_path, music_track, output_path):
-    """Add music track to a video, making sure it doesn't override existing audio"""
-    if not music_track:
-        return video_path
-
+def music_mix_args(music_track, duration, input_index):
+    """Return the extra inputs, filter graph and output args that mix a music track into the clip's audio"""
     music_path = os.path.join(DOWNLOAD_DIR, "music", f"{music_track}.mp3")
     if not os.path.exists(music_path):
         logger.warning(f"Music track not found: {music_path}")
-        return video_path
+        return None
 
-    try:
-        # Get video duration
-        _, _, video_duration = get_video_info(video_path)
-        if not video_duration:
-            logger.warning("Could not determine video duration")
-            return video_path
-
-        # Add music, keeping original audio at a significantly higher volume
-        cmd = [
-            'ffmpeg', '-y',
-            '-i', video_path,  # Input video
-            '-i', music_path,  # Input music
-            '-filter_complex',
-            # Increase original audio to 6.0x volume and decrease music to 2.0x volume
-            '[0:a]volume=6.0[a1];[1:a]volume=2.0,atrim=0:{0},aloop=loop=-1:size=2e+009[a2];[a1][a2]amix=inputs=2:duration=first[a]'.format(
-                video_duration),
-            '-map', '0:v',  # Map video from first input
-            '-map', '[a]',  # Map mixed audio
-            '-c:v', 'copy',  # Copy video codec to avoid re-encoding
-            '-c:a', 'aac',  # Audio codec
-            '-b:a', '256k',  # Higher audio bitrate for better quality
-            '-shortest',  # End when shortest input ends
-            output_path
-        ]
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        logger.info(f"Added music to video: {output_path}")
-        return output_path
-    except Exception as e:
-        logger.error(f"Error adding music: {e}")
-        return video_path
+    # Increase original audio to 6.0x volume and decrease music to 2.0x volume
+    audio_filter = (f'[0:a]volume=6.0[a1];'
+                    f'[{input_index}:a]volume=2.0,atrim=0:{duration},aloop=loop=-1:size=2e+009[a2];'
+                    f'[a1][a2]amix=inputs=2:duration=first[a]')
+    output_args = [
+        '-map', '[a]',  # Map mixed audio
+        '-c:a', 'aac',  # Audio codec
+        '-b:a', '256k',  # Higher audio bitrate for better quality
+    ]
+    return ['-i', music_path], audio_filter, output_args
 
 
 def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
@@ -510,8 +729,7 @@ def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
         except (ValueError, IndexError):
             title = titles[clip_id][0]
 
-    logger.info(f"Processing long video: {clip_id}")
-    logger.info(f"Title: {title}")
+    logger.info(f"Rendering long video {clip_id}, title: {title!r}")
 
     # Get video info
     width, height, duration = get_video_info(clip_path)
@@ -523,17 +741,13 @@ def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
     creator_name = extract_creator_name(clip_id)
     text_cta = LONG_TEXT_CTAS.get(text_cta_type, "").replace("{Creator Name}", creator_name)
 
-    # Create temp files for processing
-    temp_clip = os.path.join(TEMP_DIR, f"temp_clip_{clip_id}.mp4")
-    final_output = os.path.join(OUTPUT_DIR, f"{clip_id}_final.mp4")
+    # Output file (ffmpeg reads the downloaded clip in place, no temp copy is needed), unique per
+    # render since a day may use the same clip twice and the renders run concurrently
+    final_output = os.path.join(OUTPUT_DIR, f"{clip_id}_final-{uuid.uuid4().hex[:8]}.mp4")
 
     try:
-        # Copy the clip to temp directory
-        shutil.copy(clip_path, temp_clip)
-
         # Create text overlay image for CTA with white rounded rectangle
         cta_height = 80  # Height for CTA bar
-        text_overlay_img = os.path.join(TEMP_DIR, f"text_overlay_{clip_id}.png")
 
         # Create a transparent background image
         overlay_background = Image.new('RGBA', (width, cta_height), (0, 0, 0, 0))
@@ -541,11 +755,7 @@ def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
 
         # Use Poppins font
         cta_font_size = 40  # Smaller size for long videos
-        try:
-            font_path = os.path.join(DOWNLOAD_DIR, "fonts", "Poppins-Bold.ttf")
-            font_cta = ImageFont.truetype(font_path, cta_font_size)
-        except:
-            font_cta = ImageFont.load_default()
+        font_cta = get_font("Poppins-Bold.ttf", cta_font_size)
 
         # Calculate text dimensions
         text_bbox = draw.textbbox((0, 0), text_cta, font=font_cta)
@@ -572,25 +782,7 @@ def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
 
         # Create a rounded rectangle
         corner_radius = 18
-        rounded_rect = Image.new('RGBA', (rect_width, rect_height), (255, 255, 255, 230))
-        rounded_rect_mask = Image.new('L', (rect_width, rect_height), 0)
-        rounded_rect_draw = ImageDraw.Draw(rounded_rect_mask)
-
-        # Draw the rounded rectangle on the mask
-        rounded_rect_draw.rectangle([(corner_radius, 0), (rect_width - corner_radius, rect_height)], fill=255)
-        rounded_rect_draw.rectangle([(0, corner_radius), (rect_width, rect_height - corner_radius)], fill=255)
-
-        # Draw four circles at corners to create rounded effect
-        rounded_rect_draw.pieslice([(0, 0), (corner_radius * 2, corner_radius * 2)], 180, 270, fill=255)
-        rounded_rect_draw.pieslice([(rect_width - corner_radius * 2, 0), (rect_width, corner_radius * 2)], 270, 360,
-                                   fill=255)
-        rounded_rect_draw.pieslice([(0, rect_height - corner_radius * 2), (corner_radius * 2, rect_height)], 90, 180,
-                                   fill=255)
-        rounded_rect_draw.pieslice([(rect_width - corner_radius * 2, rect_height - corner_radius * 2),
-                                    (rect_width, rect_height)], 0, 90, fill=255)
-
-        # Apply the mask to the rectangle
-        rounded_rect.putalpha(rounded_rect_mask)
+        rounded_rect = rounded_box(rect_width, rect_height, corner_radius, (255, 255, 255, 230))
 
         # Paste the rounded rectangle onto the overlay background
         overlay_background.paste(rounded_rect, (rect_x, rect_y), rounded_rect)
@@ -600,8 +792,9 @@ def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
         text_y = rect_y + (rect_height - text_height) // 2
         draw.text((text_x, text_y), text_cta, fill=(0, 0, 0, 255), font=font_cta)  # Black text
 
-        # Save overlay image
-        overlay_background.save(text_overlay_img, "PNG")
+        # Hand the overlay's raw RGBA pixels to ffmpeg on stdin (no image encoding, no temp file)
+        text_overlay_rgba = overlay_background.tobytes()
+        overlay_input = ['-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{cta_height}', '-i', 'pipe:0']
 
         # Calculate position for CTA overlay (at bottom of video)
         cta_position = height - cta_height - 50  # 50px from bottom
@@ -610,95 +803,76 @@ def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
         cta_start_time = min(15, duration / 3)  # Add CTA after 15s or 1/3 of video
         cta_end_time = cta_start_time + 7  # Display CTA for 7 seconds
 
-        # Create video with text CTA that appears at specified time
-        with_text_cta = os.path.join(TEMP_DIR, f"with_text_cta_{clip_id}.mp4")
-        cmd = [
-            'ffmpeg', '-y',
-            '-i', temp_clip,  # Input video
-            '-i', text_overlay_img,  # Text overlay
-            '-filter_complex',
-            f'[0:v][1:v]overlay=0:{cta_position}:enable=\'between(t,{cta_start_time},{cta_end_time})\'',
-            '-c:v', 'libx264',  # Use h264 codec
-            '-crf', '23',  # Quality setting
-            '-preset', 'medium',  # Encoding speed/quality balance
+        # Resolve the end CTA video, if any
+        cta_video_path = None
+        if video_cta_type in LONG_VIDEO_CTAS:
+            cta_video_path = os.path.join(DOWNLOAD_DIR, "cta_videos", LONG_VIDEO_CTAS[video_cta_type])
+            if not os.path.exists(cta_video_path):
+                logger.warning(f"End CTA video not found: {cta_video_path}")
+                cta_video_path = None
+
+        # Text CTA overlay that appears at the specified time.  The single RGBA overlay frame is
+        # converted to yuva420p once up front, and blending happens directly in yuv420
+        overlay_filter = (f'[1:v]format=yuva420p[cta];'
+                          f'[0:v][cta]overlay=0:{cta_position}:format=yuv420:'
+                          f'enable=\'between(t,{cta_start_time},{cta_end_time})\'')
+        encode_args = [
+            *video_encoder_args(),  # h264 (hardware encoder if available), yuv420p
             '-c:a', 'aac',  # Audio codec
             '-b:a', '192k',  # Audio bitrate
-            '-pix_fmt', 'yuv420p',  # Compatible pixel format
             '-movflags', '+faststart',  # Optimize for streaming
-            with_text_cta
         ]
 
-        try:
-            subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            logger.info(f"Successfully created video with text CTA")
-        except Exception as e:
-            logger.error(f"Error adding text CTA: {e}")
-            # Fallback - just use the original video
-            logger.warning("Using fallback - copying original video")
-            shutil.copy(clip_path, with_text_cta)
-
-        # Download and add end video CTA if specified
-        final_video = with_text_cta
-
-        if video_cta_type in LONG_VIDEO_CTAS:
-            cta_video_file = LONG_VIDEO_CTAS[video_cta_type]
-            cta_video_path = os.path.join(DOWNLOAD_DIR, "cta_videos", cta_video_file)
-
-            if os.path.exists(cta_video_path):
-                # Create a file with end CTA video appended
-                with_end_cta = os.path.join(TEMP_DIR, f"with_end_cta_{clip_id}.mp4")
-
-                # Create a temporary file listing the videos to concatenate
-                concat_list = os.path.join(TEMP_DIR, f"concat_list_{clip_id}.txt")
-                with open(concat_list, 'w') as f:
-                    f.write(f"file '{with_text_cta}'\n")
-                    f.write(f"file '{cta_video_path}'\n")
-
-                # Concatenate the videos
-                concat_cmd = [
-                    'ffmpeg', '-y',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', concat_list,
-                    '-c', 'copy',
-                    with_end_cta
-                ]
-
-                try:
-                    subprocess.run(concat_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                    logger.info(f"Successfully added end CTA video")
-                    final_video = with_end_cta
-                except Exception as e:
-                    logger.error(f"Error adding end CTA video: {e}")
-                    # Keep using the video with just the text CTA
-                    final_video = with_text_cta
-            else:
-                logger.warning(f"End CTA video not found: {cta_video_path}")
-
-        # Copy the final video to output directory
-        shutil.copy(final_video, final_output)
+        # Overlay the text CTA and append the end CTA video in a single encode.  The CTA
+        # video is scaled to the clip's size so the concat filter accepts both segments.
+        created = False
+        if cta_video_path:
+            cmd = [
+                'ffmpeg', '-y',
+                '-i', clip_path,  # Input video
+                *overlay_input,  # Text overlay (stdin)
+                '-i', cta_video_path,  # End CTA video
+                '-filter_complex',
+                f'{overlay_filter},setsar=1[v0];'
+                f'[2:v]scale={width}:{height}:force_original_aspect_ratio=decrease,'
+                f'pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1[v1];'
+                f'[0:a]aformat=sample_rates=44100:channel_layouts=stereo[a0];'
+                f'[2:a]aformat=sample_rates=44100:channel_layouts=stereo[a1];'
+                f'[v0][a0][v1][a1]concat=n=2:v=1:a=1[joined][a];'
+                f'[joined]{video_upload_filter()}[v]',
+                '-map', '[v]', '-map', '[a]',
+                *encode_args,
+                final_output
+            ]
 
-        logger.info(f"Long video created: {final_output}")
+            try:
+                run_ffmpeg(cmd, input=text_overlay_rgba)
+                logger.info(f"Successfully created video with text CTA and end CTA video")
+                created = True
+            except Exception as e:
+                logger.error(f"Error adding text CTA and end CTA video: {e}")
 
-        # Clean up temp files
-        for tmp_file in [temp_clip, text_overlay_img, with_text_cta]:
-            if os.path.exists(tmp_file):
-                try:
-                    os.remove(tmp_file)
-                except:
-                    pass
+        # Without an end CTA (or if appending it failed), only add the text CTA
+        if not created:
+            cmd = [
+                'ffmpeg', '-y',
+                '-i', clip_path,  # Input video
+                *overlay_input,  # Text overlay (stdin)
+                '-filter_complex', f'{overlay_filter},{video_upload_filter()}',
+                *encode_args,
+                final_output
+            ]
 
-        if 'with_end_cta' in locals() and os.path.exists(locals()['with_end_cta']):
             try:
-                os.remove(locals()['with_end_cta'])
-            except:
-                pass
+                run_ffmpeg(cmd, input=text_overlay_rgba)
+                logger.info(f"Successfully created video with text CTA")
+            except Exception as e:
+                logger.error(f"Error adding text CTA: {e}")
+                # Fallback - just use the original video
+                logger.warning("Using fallback - copying original video")
+                shutil.copy(clip_path, final_output)
 
-        if 'concat_list' in locals() and os.path.exists(locals()['concat_list']):
-            try:
-                os.remove(locals()['concat_list'])
-            except:
-                pass
+        logger.info(f"Long video created: {final_output}")
 
         return {
             "path": final_output,
@@ -709,20 +883,19 @@ def create_long_video(clip_id, text_cta_type, video_cta_type, title_index):
 
     except Exception as e:
         logger.error(f"Error creating long video: {e}")
-        import traceback
         traceback.print_exc()  # Print full stack trace for better debugging
         return None
 
 
-def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
-    """Process a video specifically for YouTube Shorts format"""
+def create_vertical_video(clip_id, music_track, text_cta_template, output_suffix, label):
+    """Render a clip in the 9:16 Shorts/Reels format with a title at the top and a text CTA at the bottom"""
     # Download the clip file from S3
     clip_path = download_clip(clip_id, is_short=True)
     if not clip_path:
         logger.error(f"Error: Clip file not found for: {clip_id}")
         return None
 
-    # Load title for the short
+    # Load title for the short/reel
     titles = load_titles(is_short=True)
     if clip_id not in titles or not titles[clip_id]:
         logger.warning(f"No title found for clip {clip_id}")
@@ -730,8 +903,7 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
     else:
         title = format_title_into_two_lines(titles[clip_id][0])
 
-    logger.info(f"Processing YouTube Short: {clip_id}")
-    logger.info(f"Title: {title}")
+    logger.info(f"Rendering {label} {clip_id}, title: {title!r}")
 
     # Get video info
     width, height, duration = get_video_info(clip_path)
@@ -741,59 +913,34 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
 
     # Replace creator name in text CTA
     creator_name = extract_creator_name(clip_id)
-    text_cta = SHORT_TEXT_CTAS.get(text_cta_type, "").replace("{Creator Name}", creator_name)
-
-    # Create temp files
-    temp_clip = os.path.join(TEMP_DIR, f"temp_clip_{clip_id}.mp4")
+    text_cta = text_cta_template.replace("{Creator Name}", creator_name)
 
-    # Create a final output file with correct format
-    final_output = os.path.join(OUTPUT_DIR, f"{clip_id}_youtube_short.mp4")
+    # Create a final output file with correct format (ffmpeg reads the downloaded clip in place),
+    # unique per render since a day may use the same clip twice and the renders run concurrently
+    final_output = os.path.join(OUTPUT_DIR, f"{clip_id}_{output_suffix}-{uuid.uuid4().hex[:8]}.mp4")
 
     try:
-        # Copy the clip to temp directory
-        shutil.copy(clip_path, temp_clip)
-
-        # Add music if specified
-        if music_track:
-            temp_with_music = os.path.join(TEMP_DIR, f"temp_with_music_{clip_id}.mp4")
-            add_music_to_video(temp_clip, music_track, temp_with_music)
-            # Replace temp_clip with the version with music
-            if os.path.exists(temp_with_music):
-                os.remove(temp_clip)
-                os.rename(temp_with_music, temp_clip)
-                logger.info(f"Added music track {music_track} to clip")
-
-        # Format shorts to look like example image with top title and bottom CTA
-        # Get clip info for proper sizing
-        clip_width, clip_height, _ = get_video_info(temp_clip)
+        # Format shorts/reels to look like example image with top title and bottom CTA
+        # Size from the probe of the downloaded clip
+        clip_width, clip_height = width, height
 
         # Create a 9:16 aspect ratio video with black bars
         target_height = int(clip_width * 16 / 9) if clip_width > clip_height else clip_height
         target_width = int(target_height * 9 / 16) if clip_height > clip_width else clip_width
 
-        # Creating temporary files for our processing
-        with_black_bars = os.path.join(TEMP_DIR, f"with_black_bars_{clip_id}.mp4")
-        with_title = os.path.join(TEMP_DIR, f"with_title_{clip_id}.mp4")
-        with_bottom_cta = os.path.join(TEMP_DIR, f"with_bottom_cta_{clip_id}.mp4")
-
-        # Step 1: Add black bars to make it 9:16 if needed
+        # Step 1: Add black bars to make it 9:16 if needed (applied in the final filter graph)
         if clip_width > clip_height:  # Landscape video
             vertical_padding = (target_height - clip_height) // 2
-            pad_cmd = [
-                'ffmpeg', '-y',
-                '-i', temp_clip,
-                '-vf', f'pad=width={clip_width}:height={target_height}:x=0:y={vertical_padding}:color=black',
-                '-c:a', 'copy',
-                with_black_bars
-            ]
-            subprocess.run(pad_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        else:  # Already portrait
-            shutil.copy(temp_clip, with_black_bars)
+            pad_filter = (f'[0:v]pad=width={clip_width}:height={target_height}:x=0:y={vertical_padding}'
+                          f':color=black[padded];')
+            overlay_base = '[padded]'
+        else:  # Already portrait, the clip goes straight into the title overlay
+            pad_filter = ''
+            overlay_base = '[0:v]'
 
         # Step 2: Add title at the top
         # Create title image
         title_height = 170  # Height for title bar
-        title_img = os.path.join(TEMP_DIR, f"title_{clip_id}.png")
 
         # Create a transparent background image
         title_background = Image.new('RGBA', (target_width, title_height), (0, 0, 0, 0))
@@ -802,32 +949,13 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
         # Different font size for title (larger)
         title_font_size = 60  # Large size for title
 
-        try:
-            font_path = os.path.join(DOWNLOAD_DIR, "fonts", "Poppins-Bold.ttf")
-            font_title = ImageFont.truetype(font_path, title_font_size)
-        except:
-            font_title = ImageFont.load_default()
+        font_title = get_font("Poppins-Bold.ttf", title_font_size)
 
         # Improved text centering for multi-line titles
-        title_lines = title.split('\n')
         line_gap = 20  # Space between lines
 
-        # Calculate text dimensions for all lines combined
-        line_heights = []
-        total_text_height = 0
-        max_line_width = 0
-
-        for line in title_lines:
-            line_bbox = draw.textbbox((0, 0), line, font=font_title)
-            line_width = line_bbox[2] - line_bbox[0]
-            line_height = line_bbox[3] - line_bbox[1]
-            line_heights.append((line, line_width, line_height))
-            total_text_height += line_height
-            max_line_width = max(max_line_width, line_width)
-
-        # Add gaps between lines
-        if len(title_lines) > 1:
-            total_text_height += line_gap * (len(title_lines) - 1)
+        # Calculate text dimensions for all lines combined (gaps included)
+        line_heights, max_line_width, total_text_height = text_block_layout(title, font_title, line_gap)
 
         # Add padding around text for the white rounded rectangle
         h_padding = 40  # Horizontal padding
@@ -845,41 +973,16 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
         rect_x = (target_width - rect_width) // 2
         rect_y = (title_height - rect_height) // 2
 
-        # Draw rounded rectangle with white background
-        # Using PIL for rounded corners - create a separate mask
+        # Draw rounded rectangle with white background (cached across clips of the same size)
         corner_radius = 25  # Increased from 15 to 25 for more rounded corners
-        rounded_rect = Image.new('RGBA', (rect_width, rect_height), (255, 255, 255, 255))
-        rounded_rect_mask = Image.new('L', (rect_width, rect_height), 0)
-        rounded_rect_draw = ImageDraw.Draw(rounded_rect_mask)
-
-        # Draw the rounded rectangle on the mask
-        rounded_rect_draw.rectangle([(corner_radius, 0), (rect_width - corner_radius, rect_height)], fill=255)
-        rounded_rect_draw.rectangle([(0, corner_radius), (rect_width, rect_height - corner_radius)], fill=255)
-
-        # Draw four circles at corners to create rounded effect
-        rounded_rect_draw.pieslice([(0, 0), (corner_radius * 2, corner_radius * 2)], 180, 270, fill=255)
-        rounded_rect_draw.pieslice([(rect_width - corner_radius * 2, 0), (rect_width, corner_radius * 2)], 270, 360,
-                                   fill=255)
-        rounded_rect_draw.pieslice([(0, rect_height - corner_radius * 2), (corner_radius * 2, rect_height)], 90, 180,
-                                   fill=255)
-        rounded_rect_draw.pieslice(
-            [(rect_width - corner_radius * 2, rect_height - corner_radius * 2), (rect_width, rect_height)], 0, 90,
-            fill=255)
-
-        # Apply the mask to the rectangle
-        rounded_rect.putalpha(rounded_rect_mask)
+        rounded_rect = rounded_box(rect_width, rect_height, corner_radius, (255, 255, 255, 255))
 
         # Paste the rounded rectangle onto the title background
         title_background.paste(rounded_rect, (rect_x, rect_y), rounded_rect)
 
-        # Calculate text block height with line gaps
-        text_block_height = total_text_height
-        if len(title_lines) > 1:
-            text_block_height += line_gap * (len(title_lines) - 1)
-
         # Calculate starting y position with a slight upward offset for better positioning
         vertical_offset = 4  # Slight upward shift to make text appear more centered
-        text_y = rect_y + ((rect_height - text_block_height) // 2) - vertical_offset
+        text_y = rect_y + ((rect_height - total_text_height) // 2) - vertical_offset
         current_y = text_y
 
         # Draw each line centered horizontally
@@ -889,23 +992,8 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
             if i < len(line_heights) - 1:
                 current_y += line_height + line_gap
 
-        # Save title image
-        title_background.save(title_img, "PNG")
-
-        # Add title to the video
-        title_cmd = [
-            'ffmpeg', '-y',
-            '-i', with_black_bars,
-            '-i', title_img,
-            '-filter_complex', '[0:v][1:v]overlay=0:400',  # Position at top with 400px padding
-            '-c:a', 'copy',
-            with_title
-        ]
-        subprocess.run(title_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
         # Step 3: Add bottom text CTA with similar styling
         cta_height = 160  # Height for CTA bar
-        cta_img = os.path.join(TEMP_DIR, f"cta_{clip_id}.png")
 
         # Create a transparent background for CTA
         cta_background = Image.new('RGBA', (target_width, cta_height), (0, 0, 0, 0))
@@ -914,28 +1002,10 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
         # Different font size for CTA (smaller)
         cta_font_size = 45  # Smaller size for CTA
 
-        try:
-            font_path = os.path.join(DOWNLOAD_DIR, "fonts", "Poppins-Bold.ttf")
-            font_cta = ImageFont.truetype(font_path, cta_font_size)
-        except:
-            font_cta = ImageFont.load_default()
+        font_cta = get_font("Poppins-Bold.ttf", cta_font_size)
 
         # Apply the same styling for CTA
-        cta_lines = text_cta.split('\n')
-        cta_line_heights = []
-        cta_total_height = 0
-        cta_max_width = 0
-
-        for line in cta_lines:
-            line_bbox = draw.textbbox((0, 0), line, font=font_cta)
-            line_width = line_bbox[2] - line_bbox[0]
-            line_height = line_bbox[3] - line_bbox[1]
-            cta_line_heights.append((line, line_width, line_height))
-            cta_total_height += line_height
-            cta_max_width = max(cta_max_width, line_width)
-
-        if len(cta_lines) > 1:
-            cta_total_height += line_gap * (len(cta_lines) - 1)
+        cta_line_heights, cta_max_width, cta_total_height = text_block_layout(text_cta, font_cta, line_gap)
 
         # Make sure padding is equal on top and bottom
         v_padding = 15  # Equal padding for top and bottom, reduced for better alignment
@@ -953,37 +1023,14 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
         cta_rect_y = (cta_height - cta_rect_height) // 2
 
         # Draw rounded rectangle for CTA
-        cta_rounded_rect = Image.new('RGBA', (cta_rect_width, cta_rect_height), (255, 255, 255, 255))
-        cta_rounded_mask = Image.new('L', (cta_rect_width, cta_rect_height), 0)
-        cta_rounded_draw = ImageDraw.Draw(cta_rounded_mask)
-
-        # Draw the rounded rectangle on the mask
-        cta_rounded_draw.rectangle([(corner_radius, 0), (cta_rect_width - corner_radius, cta_rect_height)], fill=255)
-        cta_rounded_draw.rectangle([(0, corner_radius), (cta_rect_width, cta_rect_height - corner_radius)], fill=255)
-
-        # Draw four circles at corners to create rounded effect
-        cta_rounded_draw.pieslice([(0, 0), (corner_radius * 2, corner_radius * 2)], 180, 270, fill=255)
-        cta_rounded_draw.pieslice([(cta_rect_width - corner_radius * 2, 0), (cta_rect_width, corner_radius * 2)], 270,
-                                  360, fill=255)
-        cta_rounded_draw.pieslice([(0, cta_rect_height - corner_radius * 2), (corner_radius * 2, cta_rect_height)], 90,
-                                  180, fill=255)
-        cta_rounded_draw.pieslice([(cta_rect_width - corner_radius * 2, cta_rect_height - corner_radius * 2),
-                                   (cta_rect_width, cta_rect_height)], 0, 90, fill=255)
-
-        # Apply the mask to the rectangle
-        cta_rounded_rect.putalpha(cta_rounded_mask)
+        cta_rounded_rect = rounded_box(cta_rect_width, cta_rect_height, corner_radius, (255, 255, 255, 255))
 
         # Paste the rounded rectangle onto the CTA background
         cta_background.paste(cta_rounded_rect, (cta_rect_x, cta_rect_y), cta_rounded_rect)
 
-        # Calculate CTA text block height with line gaps
-        cta_text_block_height = cta_total_height
-        if len(cta_lines) > 1:
-            cta_text_block_height += line_gap * (len(cta_lines) - 1)
-
         # Center text vertically within the rectangle with slight upward adjustment
         vertical_offset = 4  # Same offset as for title text
-        cta_text_y = cta_rect_y + ((cta_rect_height - cta_text_block_height) // 2) - vertical_offset
+        cta_text_y = cta_rect_y + ((cta_rect_height - cta_total_height) // 2) - vertical_offset
         current_y = cta_text_y
 
         # Draw each line centered horizontally
@@ -993,37 +1040,52 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
             if i < len(cta_line_heights) - 1:
                 current_y += line_height + line_gap
 
-        # Save CTA image
-        cta_background.save(cta_img, "PNG")
+        # Stack the title and CTA into one image that is piped to ffmpeg as raw RGBA pixels
+        # (no files in /tmp and no PNG encode/decode)
+        overlays = Image.new('RGBA', (target_width, title_height + cta_height), (0, 0, 0, 0))
+        overlays.paste(title_background, (0, 0))
+        overlays.paste(cta_background, (0, title_height))
+        overlays_rgba = overlays.tobytes()
 
         # Calculate position for bottom CTA
         bottom_position = target_height - cta_height - 400
 
-        # Use a single ffmpeg command with the 'enable' parameter in the overlay filter
-        # The 'gte(t,5)' condition makes the overlay only appear after 5 seconds
-        cta_cmd = [
-            'ffmpeg', '-y',
-            '-i', with_title,
-            '-i', cta_img,
-            '-filter_complex', f'[0:v][1:v]overlay=0:{bottom_position}:enable=\'gte(t,5)\'',  # Only show after 5 seconds
-            '-c:a', 'copy',
-            with_bottom_cta
-        ]
-        logger.info(f"Running CTA command")
-        subprocess.run(cta_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # Pad, add the title (at the top with 400px padding) and the bottom CTA (only shown
+        # after 5 seconds) in a single filter graph, so the clip is decoded and encoded once
+        video_filter = (f'[1:v]split[title_strip][cta_strip];'
+                        f'[title_strip]crop={target_width}:{title_height}:0:0[title];'
+                        f'[cta_strip]crop={target_width}:{cta_height}:0:{title_height}[cta];'
+                        f'{pad_filter}'
+                        f'{overlay_base}[title]overlay=0:400[titled];'
+                        f'[titled][cta]overlay=0:{bottom_position}:enable=\'gte(t,5)\','
+                        f'{video_upload_filter()}[v]')
+        render_inputs = ['-i', clip_path, '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                         '-s', f'{target_width}x{title_height + cta_height}', '-i', 'pipe:0']
+
+        # Mix in the music track if specified, otherwise copy the clip's audio untouched
+        music_mix = music_mix_args(music_track, duration, 2) if music_track else None
+        if music_mix:
+            music_inputs, audio_filter, audio_args = music_mix
+            try:
+                run_ffmpeg(['ffmpeg', '-y', *render_inputs, *music_inputs,
+                            '-filter_complex', f'{video_filter};{audio_filter}', '-map', '[v]',
+                            *audio_args, *video_encoder_args(), final_output],
+                           input=overlays_rgba)
+                logger.info(f"Added music track {music_track} to clip")
+            except subprocess.CalledProcessError:
+                # e.g. a clip without an audio stream to mix the music into
+                logger.warning(f"Could not add music track {music_track}, keeping the original audio")
+                music_mix = None
 
-        # Step 4: We're no longer using video CTA - just copy the file with the bottom CTA
-        shutil.copy(with_bottom_cta, final_output)
+        if not music_mix:
+            run_ffmpeg(['ffmpeg', '-y', *render_inputs,
+                        '-filter_complex', video_filter, '-map', '[v]', '-map', '0:a?',
+                        '-c:a', 'copy', *video_encoder_args(), final_output],
+                       input=overlays_rgba)
 
-        logger.info(f"YouTube Short created: {final_output}")
+        # Step 4: Shorts and reels no longer get a video CTA - the rendered file is the final output
 
-        # Clean up temp files
-        for tmp_file in [temp_clip, with_black_bars, with_title, with_bottom_cta, title_img, cta_img]:
-            if os.path.exists(tmp_file):
-                try:
-                    os.remove(tmp_file)
-                except:
-                    pass  # Ignore errors during cleanup
+        logger.info(f"{label} created: {final_output}")
 
         return {
             "path": final_output,
@@ -1032,449 +1094,238 @@ def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
         }
 
     except Exception as e:
-        logger.error(f"Error creating YouTube Short: {e}")
-        import traceback
+        logger.error(f"Error creating {label}: {e}")
         traceback.print_exc()
         return None
 
 
-def create_instagram_reel(clip_id, music_track, text_cta_type, desc_cta_type):
-    """Process a video specifically for Instagram Reels format"""
-    # Download the clip file from S3
-    clip_path = download_clip(clip_id, is_short=True)
-    if not clip_path:
-        logger.error(f"Error: Clip file not found for: {clip_id}")
-        return None
+def create_youtube_short(clip_id, music_track, text_cta_type, video_cta_type):
+    """Process a video specifically for YouTube Shorts format"""
+    return create_vertical_video(clip_id, music_track, SHORT_TEXT_CTAS.get(text_cta_type, ""),
+                                 "youtube_short", "YouTube Short")
 
-    # Load title for the reel
-    titles = load_titles(is_short=True)
-    if clip_id not in titles or not titles[clip_id]:
-        logger.warning(f"No title found for clip {clip_id}")
-        title = f"{extract_creator_name(clip_id)} on\nCreating Viral Content"
-    else:
-        title = format_title_into_two_lines(titles[clip_id][0])
 
-    logger.info(f"Processing Instagram Reel: {clip_id}")
-    logger.info(f"Title: {title}")
+def create_instagram_reel(clip_id, music_track, text_cta_type, desc_cta_type):
+    """Process a video specifically for Instagram Reels format"""
+    reel = create_vertical_video(clip_id, music_track, REELS_TEXT_CTAS.get(text_cta_type, ""),
+                                 "instagram_reel", "Instagram Reel")
+    if reel:
+        # Get description CTA for Instagram
+        reel["description"] = REELS_DESC_CTAS.get(desc_cta_type, "")
+    return reel
 
-    # Get video info
-    width, height, duration = get_video_info(clip_path)
-    if not width or not height or not duration:
-        logger.error(f"Error: Could not get video info for {clip_path}")
-        return None
 
-    # Replace creator name in text CTA
-    creator_name = extract_creator_name(clip_id)
-    text_cta = REELS_TEXT_CTAS.get(text_cta_type, "").replace("{Creator Name}", creator_name)
+def scheduled_videos(tracking_data, channel_id):
+    """Return the (platform, content type, clip id) of the posts the active day's run already scheduled for a channel"""
+    with tracking_lock:
+        return {(platform, content_type, clip_id)
+                for scheduled_channel, platform, content_type, clip_id
+                in tracking_data.get("chunked_processing", {}).get("scheduled", [])
+                if scheduled_channel == channel_id}
 
-    # Get description CTA for Instagram
-    description = REELS_DESC_CTAS.get(desc_cta_type, "")
 
-    # Create temp files
-    temp_clip = os.path.join(TEMP_DIR, f"temp_clip_{clip_id}.mp4")
+def process_youtube_channel(channel_id, day_key, config, tracking_data):
+    """Render a YouTube channel's long video and shorts for a day and schedule them
 
-    # Create a final output file with correct format
-    final_output = os.path.join(OUTPUT_DIR, f"{clip_id}_instagram_reel.mp4")
+    Returns (videos scheduled, failures, futures of the background posts).
+    """
+    success_count = 0
+    error_count = 0
+    post_futures = []
 
     try:
-        # Copy the clip to temp directory
-        shutil.copy(clip_path, temp_clip)
-
-        # Add music if specified
-        if music_track:
-            temp_with_music = os.path.join(TEMP_DIR, f"temp_with_music_{clip_id}.mp4")
-            add_music_to_video(temp_clip, music_track, temp_with_music)
-            # Replace temp_clip with the version with music
-            if os.path.exists(temp_with_music):
-                os.remove(temp_clip)
-                os.rename(temp_with_music, temp_clip)
-                logger.info(f"Added music track {music_track} to clip")
-
-        # Format reels to look like example image with top title and bottom CTA
-        # Get clip info for proper sizing
-        clip_width, clip_height, _ = get_video_info(temp_clip)
-
-        # Create a 9:16 aspect ratio video with black bars
-        target_height = int(clip_width * 16 / 9) if clip_width > clip_height else clip_height
-        target_width = int(target_height * 9 / 16) if clip_height > clip_width else clip_width
-
-        # Creating temporary files for our processing
-        with_black_bars = os.path.join(TEMP_DIR, f"with_black_bars_{clip_id}.mp4")
-        with_title = os.path.join(TEMP_DIR, f"with_title_{clip_id}.mp4")
-        with_bottom_cta = os.path.join(TEMP_DIR, f"with_bottom_cta_{clip_id}.mp4")
-
-        # Step 1: Add black bars to make it 9:16 if needed
-        if clip_width > clip_height:  # Landscape video
-            vertical_padding = (target_height - clip_height) // 2
-            pad_cmd = [
-                'ffmpeg', '-y',
-                '-i', temp_clip,
-                '-vf', f'pad=width={clip_width}:height={target_height}:x=0:y={vertical_padding}:color=black',
-                '-c:a', 'copy',
-                with_black_bars
-            ]
-            subprocess.run(pad_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        else:  # Already portrait
-            shutil.copy(temp_clip, with_black_bars)
-
-        # Step 2: Add title at the top with white rounded rectangle background
-        title_height = 170  # Height for title bar
-        title_img = os.path.join(TEMP_DIR, f"title_{clip_id}.png")
-
-        # Create a transparent background image
-        title_background = Image.new('RGBA', (target_width, title_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(title_background)
-
-        # Different font size for title (larger)
-        title_font_size = 60  # Large size for title
-
-        try:
-            font_path = os.path.join(DOWNLOAD_DIR, "fonts", "Poppins-Bold.ttf")
-            font_title = ImageFont.truetype(font_path, title_font_size)
-        except:
-            font_title = ImageFont.load_default()
-
-        # Apply same styling for title as with YouTube shorts
-        title_lines = title.split('\n')
-        line_gap = 20
-        line_heights = []
-        total_text_height = 0
-        max_line_width = 0
-
-        for line in title_lines:
-            line_bbox = draw.textbbox((0, 0), line, font=font_title)
-            line_width = line_bbox[2] - line_bbox[0]
-            line_height = line_bbox[3] - line_bbox[1]
-            line_heights.append((line, line_width, line_height))
-            total_text_height += line_height
-            max_line_width = max(max_line_width, line_width)
-
-        # Add gaps between lines
-        if len(title_lines) > 1:
-            total_text_height += line_gap * (len(title_lines) - 1)
-
-        # Add padding around text for the white rounded rectangle
-        h_padding = 40  # Horizontal padding
-        v_padding_top = 15  # Less padding for better vertical alignment
-        v_padding_bottom = 15  # Equal padding
-
-        # Calculate the white background rectangle dimensions
-        rect_width = max_line_width + (2 * h_padding)
-        rect_height = total_text_height + v_padding_top + v_padding_bottom
-
-        # Make sure the white box is not too wide (max 80% of screen width)
-        rect_width = min(rect_width, int(target_width * 0.8))
-
-        # Calculate positions for the white rectangle
-        rect_x = (target_width - rect_width) // 2
-        rect_y = (title_height - rect_height) // 2
-
-        # Draw rounded rectangle with white background
-        corner_radius = 25  # Increased for more rounded corners
-        rounded_rect = Image.new('RGBA', (rect_width, rect_height), (255, 255, 255, 255))
-        rounded_rect_mask = Image.new('L', (rect_width, rect_height), 0)
-        rounded_rect_draw = ImageDraw.Draw(rounded_rect_mask)
-
-        # Draw the rounded rectangle on the mask
-        rounded_rect_draw.rectangle([(corner_radius, 0), (rect_width - corner_radius, rect_height)], fill=255)
-        rounded_rect_draw.rectangle([(0, corner_radius), (rect_width, rect_height - corner_radius)], fill=255)
-
-        # Draw four circles at corners to create rounded effect
-        rounded_rect_draw.pieslice([(0, 0), (corner_radius * 2, corner_radius * 2)], 180, 270, fill=255)
-        rounded_rect_draw.pieslice([(rect_width - corner_radius * 2, 0), (rect_width, corner_radius * 2)], 270, 360,
-                               fill=255)
-        rounded_rect_draw.pieslice([(0, rect_height - corner_radius * 2), (corner_radius * 2, rect_height)], 90, 180,
-                               fill=255)
-        rounded_rect_draw.pieslice([(rect_width - corner_radius * 2, rect_height - corner_radius * 2),
-                               (rect_width, rect_height)], 0, 90, fill=255)
-
-        # Apply the mask to the rectangle
-        rounded_rect.putalpha(rounded_rect_mask)
-
-        # Paste the rounded rectangle onto the title background
-        title_background.paste(rounded_rect, (rect_x, rect_y), rounded_rect)
-
-        # Calculate text block height with line gaps
-        text_block_height = total_text_height
-        if len(title_lines) > 1:
-            text_block_height += line_gap * (len(title_lines) - 1)
-
-        # Calculate starting y position with a slight upward offset for better positioning
-        vertical_offset = 4  # Slight upward shift to make text appear more centered
-        text_y = rect_y + ((rect_height - text_block_height) // 2) - vertical_offset
-        current_y = text_y
-
-        # Draw each line centered horizontally
-        for i, (line, line_width, line_height) in enumerate(line_heights):
-            text_x = rect_x + (rect_width - line_width) // 2
-            draw.text((text_x, current_y), line, fill=(0, 0, 0, 255), font=font_title)
-            if i < len(line_heights) - 1:
-                current_y += line_height + line_gap
-
-        # Save title image
-        title_background.save(title_img, "PNG")
-
-        # Add title to the video
-        title_cmd = [
-            'ffmpeg', '-y',
-            '-i', with_black_bars,
-            '-i', title_img,
-            '-filter_complex', '[0:v][1:v]overlay=0:400',  # Position at top with 400px padding
-            '-c:a', 'copy',
-            with_title
-        ]
-        subprocess.run(title_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-        # Step 3: Add bottom text CTA with similar styling to shorts
-        cta_height = 160  # Height for CTA bar
-        cta_img = os.path.join(TEMP_DIR, f"cta_{clip_id}.png")
-
-        # Create a transparent background for CTA
-        cta_background = Image.new('RGBA', (target_width, cta_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(cta_background)
-
-        # Use the same font size for CTA as in shorts
-        cta_font_size = 45
-
-        try:
-            font_path = os.path.join(DOWNLOAD_DIR, "fonts", "Poppins-Bold.ttf")
-            font_cta = ImageFont.truetype(font_path, cta_font_size)
-        except:
-            font_cta = ImageFont.load_default()
-
-        # Apply the same styling for CTA as with shorts
-        cta_lines = text_cta.split('\n')
-        cta_line_heights = []
-        cta_total_height = 0
-        cta_max_width = 0
-
-        for line in cta_lines:
-            line_bbox = draw.textbbox((0, 0), line, font=font_cta)
-            line_width = line_bbox[2] - line_bbox[0]
-            line_height = line_bbox[3] - line_bbox[1]
-            cta_line_heights.append((line, line_width, line_height))
-            cta_total_height += line_height
-            cta_max_width = max(cta_max_width, line_width)
-
-        if len(cta_lines) > 1:
-            cta_total_height += line_gap * (len(cta_lines) - 1)
-
-        # Add padding around text
-        h_padding = 40  # Horizontal padding
-        v_padding = 15  # Vertical padding (reduced for better alignment)
-
-        # Calculate CTA rectangle dimensions
-        cta_rect_width = cta_max_width + (2 * h_padding)
-        cta_rect_height = cta_total_height + (2 * v_padding)  # Equal padding on top and bottom
-
-        # Make sure the white box is not too wide (max 80% of screen width)
-        cta_rect_width = min(cta_rect_width, int(target_width * 0.8))
-
-        # Calculate positions for the CTA rectangle
-        # Use a left offset as in shorts to create asymmetric look
-        left_offset = 40  # Adjust this value to control how far left the CTA appears
-        cta_rect_x = ((target_width - cta_rect_width) // 2) - left_offset
-        cta_rect_y = (cta_height - cta_rect_height) // 2
+        channel_data = config["youtubeChannels"][channel_id]
+        if day_key not in channel_data:
+            logger.info(f"No content scheduled for {channel_id} on {day_key}")
+            return success_count, error_count, post_futures
+
+        day_data = channel_data[day_key]
+        render_jobs = []
+
+        # Videos an interrupted earlier run already scheduled for this day are not made again
+        scheduled = scheduled_videos(tracking_data, channel_id)
+
+        # Collect the long video
+        long_data = day_data.get("long", {})
+        if long_data:
+            clip_id = long_data.get("clip")
+            text_cta = long_data.get("textCTA")
+            video_cta = long_data.get("videoCTA")
+            title_index = long_data.get("title")
+            post_time = long_data.get("postTime")
+
+            if ("YouTube", "long", clip_id) in scheduled:
+                logger.info(f"Long video {clip_id} for {channel_id} was already scheduled, skipping")
+            elif clip_id and text_cta and video_cta and post_time:
+                logger.info(f"Processing long video for {channel_id}: {clip_id} (text CTA: {text_cta}, "
+                            f"video CTA: {video_cta}, post time: {post_time})")
+                render_jobs.append(("long", post_time, create_long_video,
+                                    (clip_id, text_cta, video_cta, title_index)))
+
+        # Collect the YouTube shorts
+        shorts_data = day_data.get("shorts", [])
+        for i, short in enumerate(shorts_data):
+            clip_id = short.get("clip")
+            music_track = short.get("musicTrack")
+            text_cta = short.get("textCTA")
+            video_cta = short.get("videoCTA")
+            post_time = short.get("postTime")
+
+            if ("YouTube", "short", clip_id) in scheduled:
+                logger.info(f"YT Short {clip_id} for {channel_id} was already scheduled, skipping")
+            elif clip_id and text_cta and video_cta and post_time:
+                logger.info(f"Processing YT Short {i + 1}/{len(shorts_data)} for {channel_id}: {clip_id} "
+                            f"(music: {music_track}, text CTA: {text_cta}, video CTA: {video_cta}, "
+                            f"post time: {post_time})")
+                render_jobs.append(("short", post_time, create_youtube_short,
+                                    (clip_id, music_track, text_cta, video_cta)))
+
+        # Render the channel's videos concurrently, then schedule them in order
+        videos = render_videos([(render, args) for _, _, render, args in render_jobs])
+        for (content_type, post_time, _, _), video in zip(render_jobs, videos):
+            post = False
+            if video:
+                post = schedule_post("YouTube", content_type, channel_id, None, video, post_time, config,
+                                     tracking_data)
+                if isinstance(post, Future):
+                    post_futures.append(post)
+
+            # A video that failed to render or to be scheduled will never go out
+            if post:
+                success_count += 1
+            else:
+                error_count += 1
 
-        # Draw rounded rectangle for CTA with same design as shorts
-        cta_rounded_rect = Image.new('RGBA', (cta_rect_width, cta_rect_height), (255, 255, 255, 255))
-        cta_rounded_mask = Image.new('L', (cta_rect_width, cta_rect_height), 0)
-        cta_rounded_draw = ImageDraw.Draw(cta_rounded_mask)
+    except Exception as e:
+        logger.error(f"Error processing YouTube channel {channel_id} for {day_key}: {e}")
+        error_count += 1
 
-        # Draw the rounded rectangle on the mask
-        cta_rounded_draw.rectangle([(corner_radius, 0), (cta_rect_width - corner_radius, cta_rect_height)], fill=255)
-        cta_rounded_draw.rectangle([(0, corner_radius), (cta_rect_width, cta_rect_height - corner_radius)], fill=255)
+    return success_count, error_count, post_futures
 
-        # Draw four circles at corners to create rounded effect
-        cta_rounded_draw.pieslice([(0, 0), (corner_radius * 2, corner_radius * 2)], 180, 270, fill=255)
-        cta_rounded_draw.pieslice([(cta_rect_width - corner_radius * 2, 0), (cta_rect_width, corner_radius * 2)], 270,
-                              360, fill=255)
-        cta_rounded_draw.pieslice([(0, cta_rect_height - corner_radius * 2), (corner_radius * 2, cta_rect_height)], 90,
-                              180, fill=255)
-        cta_rounded_draw.pieslice([(cta_rect_width - corner_radius * 2, cta_rect_height - corner_radius * 2),
-                               (cta_rect_width, cta_rect_height)], 0, 90, fill=255)
 
-        # Apply the mask to the rectangle
-        cta_rounded_rect.putalpha(cta_rounded_mask)
+def process_instagram_account(account_id, day_key, config, tracking_data):
+    """Render an Instagram account's reels for a day and schedule them
 
-        # Paste the rounded rectangle onto the CTA background
-        cta_background.paste(cta_rounded_rect, (cta_rect_x, cta_rect_y), cta_rounded_rect)
-
-        # Calculate CTA text block height with line gaps
-        cta_text_block_height = cta_total_height
-        if len(cta_lines) > 1:
-            cta_text_block_height += line_gap * (len(cta_lines) - 1)
-
-        # Center text vertically within the rectangle with slight upward adjustment
-        vertical_offset = 4  # Same offset as for title text
-        cta_text_y = cta_rect_y + ((cta_rect_height - cta_text_block_height) // 2) - vertical_offset
-        current_y = cta_text_y
-
-        # Draw each line centered horizontally
-        for i, (line, line_width, line_height) in enumerate(cta_line_heights):
-            text_x = cta_rect_x + (cta_rect_width - line_width) // 2
-            draw.text((text_x, current_y), line, fill=(0, 0, 0, 255), font=font_cta)
-            if i < len(cta_line_heights) - 1:
-                current_y += line_height + line_gap
+    Returns (videos scheduled, failures, futures of the background posts).
+    """
+    success_count = 0
+    error_count = 0
+    post_futures = []
 
-        # Save CTA image
-        cta_background.save(cta_img, "PNG")
+    try:
+        account_data = config["instagramAccounts"][account_id]
+        if day_key not in account_data:
+            logger.info(f"No content scheduled for Instagram {account_id} on {day_key}")
+            return success_count, error_count, post_futures
+
+        reels_data = account_data[day_key].get("reels", [])
+
+        # Map Instagram account to YouTube channel (assuming account1 corresponds to channel1)
+        channel_id = f"channel{account_id.replace('account', '')}"
+
+        # Reels an interrupted earlier run already scheduled for this day are not made again
+        scheduled = scheduled_videos(tracking_data, channel_id)
+
+        # Collect the reels of the day
+        render_jobs = []
+        for i, reel in enumerate(reels_data):
+            clip_id = reel.get("clip")
+            music_track = reel.get("musicTrack")
+            text_cta = reel.get("textCTA")
+            desc_cta = reel.get("descriptionCTA")
+            post_time = reel.get("postTime")
+
+            if ("Instagram", "reel", clip_id) in scheduled:
+                logger.info(f"IG Reel {clip_id} for {account_id} was already scheduled, skipping")
+            elif clip_id and text_cta and post_time:
+                logger.info(f"Processing IG Reel {i + 1}/{len(reels_data)} for {account_id}: {clip_id} "
+                            f"(music: {music_track}, text CTA: {text_cta}, description CTA: {desc_cta}, "
+                            f"post time: {post_time})")
+                render_jobs.append((post_time, create_instagram_reel, (clip_id, music_track, text_cta, desc_cta)))
+
+        # Render the reels concurrently, then schedule them in order
+        reel_videos = render_videos([(render, args) for _, render, args in render_jobs])
+        for (post_time, _, _), reel_video in zip(render_jobs, reel_videos):
+            post = False
+            if reel_video:
+                post = schedule_post("Instagram", "reel", channel_id, account_id, reel_video, post_time,
+                                     config, tracking_data)
+                if isinstance(post, Future):
+                    post_futures.append(post)
+
+            # A reel that failed to render or to be scheduled will never go out
+            if post:
+                success_count += 1
+            else:
+                error_count += 1
 
-        # Calculate position for bottom CTA
-        # Position at the bottom with some padding
-        bottom_position = target_height - cta_height - 400
+    except Exception as e:
+        logger.error(f"Error processing Instagram account {account_id} for {day_key}: {e}")
+        error_count += 1
 
-        # Use the same approach as shorts with timed overlay
-        cta_cmd = [
-            'ffmpeg', '-y',
-            '-i', with_title,
-            '-i', cta_img,
-            '-filter_complex',
-            # Only show after 5 seconds - simplified command
-            f'[0:v][1:v]overlay=0:{bottom_position}:enable=\'gte(t,5)\'',
-            '-c:a', 'copy',
-            with_bottom_cta
-        ]
-        subprocess.run(cta_cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    return success_count, error_count, post_futures
 
-        # For Instagram reels, we don't add a final video CTA
-        # Just use the version with the title and bottom CTA
-        shutil.copy(with_bottom_cta, final_output)
 
-        logger.info(f"Instagram Reel created: {final_output}")
+def process_day(config, day_key, tracking_data, deadline):
+    """Process the day's pending channels/accounts until all are done or the deadline passes
 
-        # Clean up temp files
-        for tmp_file in [temp_clip, with_black_bars, with_title, with_bottom_cta, title_img, cta_img]:
-            if os.path.exists(tmp_file):
-                try:
-                    os.remove(tmp_file)
-                except:
-                    pass  # Ignore errors during cleanup
+    Each finished channel is moved from channels_pending to channels_processed in the tracker, so an
+    interrupted day resumes where it stopped. Returns (videos scheduled, failures) once the background
+    posts are done.
+    """
+    chunked = tracking_data["chunked_processing"]
+    success_count = 0
+    error_count = 0
 
-        return {
-            "path": final_output,
-            "title": title,
-            "description": description,
-            "clip_id": clip_id
-        }
+    # Posts running in the background, waited for before the run ends
+    post_futures = []
 
-    except Exception as e:
-        logger.error(f"Error creating Instagram Reel: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    # Process channels until we're out of time or done with all channels
+    while chunked["channels_pending"] and time.monotonic() < deadline:
+        # Get the next channel/account to process
+        current = chunked["channels_pending"][0]
 
+        if current.startswith("instagram_"):
+            # Process Instagram account
+            account_id = current.replace("instagram_", "")
+            logger.info(f"Processing Instagram account {account_id} for {day_key}")
+            processed = process_instagram_account(account_id, day_key, config, tracking_data)
+        else:
+            # Process YouTube channel
+            logger.info(f"Processing YouTube channel {current} for {day_key}")
+            processed = process_youtube_channel(current, day_key, config, tracking_data)
 
-def process_day(config, day_key, tracking_data):
-    """Process videos for a specific day across all channels"""
-    success_count = 0
-    error_count = 0
+        channel_successes, channel_errors, channel_posts = processed
+        success_count += channel_successes
+        error_count += channel_errors
+        post_futures += channel_posts
 
-    # Process all YouTube channels
-    for channel_id in config.get("youtubeChannels", {}):
-        try:
-            channel_data = config["youtubeChannels"][channel_id]
-
-            if day_key not in channel_data:
-                logger.info(f"No content scheduled for {channel_id} on {day_key}")
-                continue
-
-            day_data = channel_data[day_key]
-
-            # Process long video
-            long_data = day_data.get("long", {})
-            if long_data:
-                clip_id = long_data.get("clip")
-                text_cta = long_data.get("textCTA")
-                video_cta = long_data.get("videoCTA")
-                title_index = long_data.get("title")
-                post_time = long_data.get("postTime")
-
-                if clip_id and text_cta and video_cta and post_time:
-                    logger.info(f"\nProcessing LONG video for {channel_id}: {clip_id}")
-                    logger.info(f"  Text CTA: {text_cta}")
-                    logger.info(f"  Video CTA: {video_cta}")
-                    logger.info(f"  Post Time: {post_time}")
-
-                    long_video = create_long_video(clip_id, text_cta, video_cta, title_index)
-                    if long_video:
-                        schedule_post("YouTube", "long", channel_id, None, long_video, post_time, config, tracking_data)
-                        success_count += 1
-                    else:
-                        logger.error(f"Failed to create long video for {channel_id}: {clip_id}")
-                        error_count += 1
-
-            # Process YouTube shorts
-            shorts_data = day_data.get("shorts", [])
-            for i, short in enumerate(shorts_data):
-                clip_id = short.get("clip")
-                music_track = short.get("musicTrack")
-                text_cta = short.get("textCTA")
-                video_cta = short.get("videoCTA")
-                post_time = short.get("postTime")
-
-                if clip_id and text_cta and video_cta and post_time:
-                    logger.info(f"\nProcessing YOUTUBE SHORT {i + 1}/{len(shorts_data)} for {channel_id}: {clip_id}")
-                    logger.info(f"  Music: {music_track}")
-                    logger.info(f"  Text CTA: {text_cta}")
-                    logger.info(f"  Video CTA: {video_cta}")
-                    logger.info(f"  Post Time: {post_time}")
-
-                    short_video = create_youtube_short(clip_id, music_track, text_cta, video_cta)
-                    if short_video:
-                        schedule_post("YouTube", "short", channel_id, None, short_video, post_time, config,
-                                      tracking_data)
-                        success_count += 1
-                    else:
-                        logger.error(f"Failed to create YouTube short for {channel_id}: {clip_id}")
-                        error_count += 1
+        # Mark this channel as processed
+        with tracking_lock:
+            chunked["channels_processed"].append(current)
+            chunked["channels_pending"].remove(current)
+            update_tracking_data(tracking_data, force=True)
 
-        except Exception as e:
-            logger.error(f"Error processing YouTube channel {channel_id} for {day_key}: {e}")
-            error_count += 1
+    # Wait for the posts that are still waiting for their time slot or uploading
+    if post_futures:
+        logger.info(f"Waiting for {len(post_futures)} scheduled posts to finish")
+        wait(post_futures)
 
-    # Process all Instagram accounts
-    for account_id in config.get("instagramAccounts", {}):
-        try:
-            account_data = config["instagramAccounts"][account_id]
-
-            if day_key not in account_data:
-                logger.info(f"No content scheduled for Instagram {account_id} on {day_key}")
-                continue
-
-            ig_data = account_data[day_key]
-            reels_data = ig_data.get("reels", [])
-
-            for i, reel in enumerate(reels_data):
-                clip_id = reel.get("clip")
-                music_track = reel.get("musicTrack")
-                text_cta = reel.get("textCTA")
-                desc_cta = reel.get("descriptionCTA")
-                post_time = reel.get("postTime")
-
-                if clip_id and text_cta and post_time:
-                    logger.info(f"\nProcessing INSTAGRAM REEL {i + 1}/{len(reels_data)} for {account_id}: {clip_id}")
-                    logger.info(f"  Music: {music_track}")
-                    logger.info(f"  Text CTA: {text_cta}")
-                    logger.info(f"  Description CTA: {desc_cta}")
-                    logger.info(f"  Post Time: {post_time}")
-
-                    reel_video = create_instagram_reel(clip_id, music_track, text_cta, desc_cta)
-                    if reel_video:
-                        # Map Instagram account to YouTube channel (assuming account1 corresponds to channel1)
-                        channel_id = f"channel{account_id.replace('account', '')}"
-                        schedule_post("Instagram", "reel", channel_id, account_id, reel_video, post_time, config,
-                                      tracking_data)
-                        success_count += 1
-                    else:
-                        logger.error(f"Failed to create Instagram reel for {account_id}: {clip_id}")
-                        error_count += 1
+    return success_count, error_count
 
-        except Exception as e:
-            logger.error(f"Error processing Instagram account {account_id} for {day_key}: {e}")
-            error_count += 1
 
-    return success_count, error_count
+def render_videos(render_jobs):
+    """Run (render function, args) jobs concurrently, returning their results in order (None on failure)"""
+    results = []
+    with ThreadPoolExecutor(max_workers=RENDER_WORKERS) as pool:
+        futures = [pool.submit(render, *args) for render, args in render_jobs]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                logger.error(f"Error rendering video: {e}")
+                results.append(None)
+    return results
 
 
 def cleanup():
@@ -1491,38 +1342,30 @@ def cleanup():
 def lambda_handler(event, context):
     """AWS Lambda handler function with chunked processing"""
     try:
-        # Add PIL path fix
-        import sys
-        import os
-
-        def fix_pillow_path():
-            for path in sys.path:
-                if os.path.isdir(os.path.join(path, 'PIL')):
-                    sys.path.append(os.path.join(path, 'PIL'))
-                    logger.info(f"Added PIL path: {os.path.join(path, 'PIL')}")
-                    break
-
-        # Apply the PIL path fix
-        fix_pillow_path()
+        # A post handed back by EventBridge Scheduler at its post time
+        if event and "post_data" in event:
+            return publish_scheduled_post(event["post_data"])
 
         # Check instagram-private-api version
-        try:
-            instagram_version = pkg_resources.get_distribution("instagram_private_api").version
-            logger.info(f"Using instagram-private-api version: {instagram_version}")
+        if INSTAGRAM_API_VERSION:
+            logger.info(f"Using instagram-private-api version: {INSTAGRAM_API_VERSION}")
 
             # Add compatibility fix for older version if needed
-            if instagram_version == "1.6.0.0":
+            if INSTAGRAM_API_VERSION == "1.6.0.0":
                 logger.info("Using compatibility mode for instagram-private-api 1.6.0.0")
-        except Exception as e:
-            logger.warning(f"Could not determine instagram-private-api version: {e}")
+        else:
+            logger.warning("Could not determine instagram-private-api version")
 
         logger.info("Starting social media autoposter Lambda function")
 
+        # The calendar day this run belongs to (also when it finishes after midnight)
+        run_date = datetime.date.today().isoformat()
+
         # Set up necessary directories
         setup_directories()
 
-        # Download fonts and assets
-        download_fonts_and_assets()
+        # Fetch the schedule, tracker and titles in one go (later loads hit the cache)
+        prefetch_json_from_s3()
 
         # Load configuration
         config = load_config_from_s3()
@@ -1541,7 +1384,8 @@ def lambda_handler(event, context):
             tracking_data["chunked_processing"] = {
                 "active_day": None,
                 "channels_processed": [],
-                "channels_pending": []
+                "channels_pending": [],
+                "scheduled": []
             }
 
         # Check if we're in the middle of processing a day
@@ -1563,133 +1407,26 @@ def lambda_handler(event, context):
             # Initialize tracking for the new day
             chunked["active_day"] = day_to_process
             chunked["channels_processed"] = []
+            chunked["scheduled"] = []
 
             # Get all YouTube channels and Instagram accounts to process
             all_channels = list(config.get("youtubeChannels", {}).keys())
             all_accounts = [f"instagram_{acc}" for acc in config.get("instagramAccounts", {}).keys()]
             chunked["channels_pending"] = all_channels + all_accounts
 
-            update_tracking_data(tracking_data)
+            update_tracking_data(tracking_data, force=True)
             logger.info(
                 f"Starting to process {day_to_process} with {len(chunked['channels_pending'])} channels/accounts")
 
-        # Process videos in chunks to stay within Lambda time limits
-        success_count = 0
-        error_count = 0
+        # Download fonts and only the CTA videos, music tracks and clips the remaining channels need
+        video_cta_types, music_tracks = assets_for_day(config, day_to_process, chunked["channels_pending"])
+        download_fonts_and_assets(video_cta_types, music_tracks,
+                                  clips_for_day(config, day_to_process, chunked["channels_pending"]))
 
-        # Get time remaining (leave 30 seconds buffer)
-        start_time = time.time()
+        # Process videos in chunks to stay within Lambda time limits (leave 30 seconds buffer)
         max_process_time = 840  # 14 minutes in seconds (15 min limit - 1 min buffer)
-
-        # Process channels until we're out of time or done with all channels
-        while chunked["channels_pending"] and (time.time() - start_time) < max_process_time:
-            # Get the next channel/account to process
-            current = chunked["channels_pending"][0]
-
-            if current.startswith("instagram_"):
-                # Process Instagram account
-                account_id = current.replace("instagram_", "")
-                logger.info(f"Processing Instagram account {account_id} for {day_to_process}")
-
-                try:
-                    account_data = config["instagramAccounts"][account_id]
-                    if day_to_process in account_data:
-                        ig_data = account_data[day_to_process]
-                        reels_data = ig_data.get("reels", [])
-
-                        for i, reel in enumerate(reels_data):
-                            clip_id = reel.get("clip")
-                            music_track = reel.get("musicTrack")
-                            text_cta = reel.get("textCTA")
-                            desc_cta = reel.get("descriptionCTA")
-                            post_time = reel.get("postTime")
-
-                            if clip_id and text_cta and post_time:
-                                logger.info(f"Processing IG Reel {i + 1}/{len(reels_data)}: {clip_id}")
-                                reel_video = create_instagram_reel(clip_id, music_track, text_cta, desc_cta)
-                                if reel_video:
-                                    # Map IG account to YT channel
-                                    channel_id = f"channel{account_id.replace('account', '')}"
-                                    schedule_post("Instagram", "reel", channel_id, account_id, reel_video, post_time,
-                                                  config, tracking_data)
-                                    success_count += 1
-                                else:
-                                    error_count += 1
-
-                            # Check time after each video
-                            if (time.time() - start_time) >= max_process_time:
-                                logger.info("Time limit approaching, pausing processing")
-                                break
-
-                except Exception as e:
-                    logger.error(f"Error processing Instagram account {account_id}: {e}")
-                    error_count += 1
-            else:
-                # Process YouTube channel
-                channel_id = current
-                logger.info(f"Processing YouTube channel {channel_id} for {day_to_process}")
-
-                try:
-                    channel_data = config["youtubeChannels"][channel_id]
-                    if day_to_process in channel_data:
-                        day_data = channel_data[day_to_process]
-
-                        # Process long video
-                        long_data = day_data.get("long", {})
-                        if long_data:
-                            clip_id = long_data.get("clip")
-                            text_cta = long_data.get("textCTA")
-                            video_cta = long_data.get("videoCTA")
-                            title_index = long_data.get("title")
-                            post_time = long_data.get("postTime")
-
-                            if clip_id and text_cta and video_cta and post_time:
-                                logger.info(f"Processing long video: {clip_id}")
-                                long_video = create_long_video(clip_id, text_cta, video_cta, title_index)
-                                if long_video:
-                                    schedule_post("YouTube", "long", channel_id, None, long_video, post_time, config,
-                                                  tracking_data)
-                                    success_count += 1
-                                else:
-                                    error_count += 1
-
-                        # Check time after processing long video
-                        if (time.time() - start_time) >= max_process_time:
-                            logger.info("Time limit approaching, pausing processing")
-                            break
-
-                        # Process YouTube shorts
-                        shorts_data = day_data.get("shorts", [])
-                        for i, short in enumerate(shorts_data):
-                            clip_id = short.get("clip")
-                            music_track = short.get("musicTrack")
-                            text_cta = short.get("textCTA")
-                            video_cta = short.get("videoCTA")
-                            post_time = short.get("postTime")
-
-                            if clip_id and text_cta and video_cta and post_time:
-                                logger.info(f"Processing YT Short {i + 1}/{len(shorts_data)}: {clip_id}")
-                                short_video = create_youtube_short(clip_id, music_track, text_cta, video_cta)
-                                if short_video:
-                                    schedule_post("YouTube", "short", channel_id, None, short_video, post_time, config,
-                                                  tracking_data)
-                                    success_count += 1
-                                else:
-                                    error_count += 1
-
-                            # Check time after each short
-                            if (time.time() - start_time) >= max_process_time:
-                                logger.info("Time limit approaching, pausing processing")
-                                break
-
-                except Exception as e:
-                    logger.error(f"Error processing YouTube channel {channel_id}: {e}")
-                    error_count += 1
-
-            # Mark this channel as processed
-            chunked["channels_processed"].append(current)
-            chunked["channels_pending"].remove(current)
-            update_tracking_data(tracking_data)
+        deadline = time.monotonic() + max_process_time
+        success_count, error_count = process_day(config, day_to_process, tracking_data, deadline)
 
         # Check if we've completed all channels for this day
         if not chunked["channels_pending"]:
@@ -1698,8 +1435,9 @@ def lambda_handler(event, context):
             tracking_data["chunked_processing"]["active_day"] = None
             tracking_data["chunked_processing"]["channels_processed"] = []
             tracking_data["chunked_processing"]["channels_pending"] = []
+            tracking_data["chunked_processing"]["scheduled"] = []
             # Update last processed day
-            tracking_data["last_processed_day"] = datetime.datetime.now().strftime("%Y-%m-%d")
+            tracking_data["last_processed_day"] = run_date
             tracking_data["last_processed_key"] = day_to_process
         else:
             logger.info(f"Partially processed {day_to_process}. Will continue in next execution.")
@@ -1707,7 +1445,7 @@ def lambda_handler(event, context):
             logger.info(f"Pending: {chunked['channels_pending']}")
 
         # Update tracking data
-        update_tracking_data(tracking_data)
+        update_tracking_data(tracking_data, force=True)
 
         # Clean up
         cleanup()
@@ -1719,7 +1457,6 @@ def lambda_handler(event, context):
 
     except Exception as e:
         logger.error(f"Error in lambda_handler: {e}")
-        import traceback
         traceback.print_exc()
 
         # Clean up even if there's an error
@@ -1750,9 +1487,6 @@ def initialize_youtube_client(channel_id, config):
             return None
 
         # Set up API client
-        import google.oauth2.credentials
-        import googleapiclient.discovery
-
         credentials = google.oauth2.credentials.Credentials(
             None,
             refresh_token=refresh_token,
@@ -1789,8 +1523,18 @@ def initialize_instagram_client(account_id, config):
             logger.error(f"Missing Instagram API credentials for account {account_id}")
             return None
 
-        # Set up API client
-        client = Client(username, password)
+        # Set up API client, reusing the saved login session (cookies, device ids) when there is one
+        client = None
+        settings = load_instagram_settings(account_id)
+        if settings:
+            try:
+                client = Client(username, password, settings=settings)
+            except (ClientCookieExpiredError, ClientLoginRequiredError):
+                logger.info(f"Saved Instagram session for {account_id} expired, logging in again")
+
+        if client is None:
+            client = Client(username, password,
+                            on_login=lambda new_client: save_instagram_settings(account_id, new_client.settings))
         instagram_clients[account_id] = client
 
         logger.info(f"Initialized Instagram client for account {account_id}")
@@ -1801,6 +1545,115 @@ def initialize_instagram_client(account_id, config):
         return None
 
 
+def instagram_settings_path(account_id):
+    """Local file holding the saved Instagram session of an account"""
+    return os.path.join(INSTAGRAM_SETTINGS_DIR, f"ig_{account_id}.json")
+
+
+def encode_instagram_settings(value):
+    """json default hook: the session's cookie jar is bytes, stored base64-encoded"""
+    if isinstance(value, bytes):
+        return {"__class__": "bytes", "__value__": base64.b64encode(value).decode()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def decode_instagram_settings(obj):
+    """json object hook reversing encode_instagram_settings"""
+    if obj.get("__class__") == "bytes":
+        return base64.b64decode(obj["__value__"])
+    return obj
+
+
+def load_instagram_settings(account_id):
+    """Load the saved Instagram session of an account (local copy first, then S3), if any"""
+    try:
+        try:
+            with open(instagram_settings_path(account_id), "rb") as f:
+                body = f.read()
+        except FileNotFoundError:
+            # A new container: fall back to the copy shared through S3
+            body = s3_client.get_object(Bucket=CONFIG_BUCKET,
+                                        Key=f"{INSTAGRAM_SESSIONS_PREFIX}{account_id}.json")['Body'].read()
+        return json.loads(body, object_hook=decode_instagram_settings)
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    except Exception as e:
+        logger.warning(f"Could not load the saved Instagram session for {account_id}: {e}")
+        return None
+
+
+def save_instagram_settings(account_id, settings):
+    """Save the Instagram session of an account after a login, locally and in S3"""
+    try:
+        body = json.dumps(settings, default=encode_instagram_settings).encode()
+        os.makedirs(INSTAGRAM_SETTINGS_DIR, exist_ok=True)
+        with open(instagram_settings_path(account_id), "wb") as f:
+            f.write(body)
+        s3_client.put_object(Bucket=CONFIG_BUCKET, Key=f"{INSTAGRAM_SESSIONS_PREFIX}{account_id}.json",
+                             Body=body, ContentType="application/json")
+        logger.info(f"Saved Instagram session for {account_id}")
+    except Exception as e:
+        logger.warning(f"Could not save the Instagram session for {account_id}: {e}")
+
+
+def discard_instagram_settings(account_id):
+    """Delete the saved Instagram session of an account (once the server no longer accepts it), locally and in S3"""
+    try:
+        try:
+            os.remove(instagram_settings_path(account_id))
+        except FileNotFoundError:
+            pass
+        # Otherwise every new container would load the dead session again
+        s3_client.delete_object(Bucket=CONFIG_BUCKET, Key=f"{INSTAGRAM_SESSIONS_PREFIX}{account_id}.json")
+    except Exception as e:
+        logger.warning(f"Could not discard the Instagram session for {account_id}: {e}")
+
+
+def retry_on_transient(max_attempts=4, base_delay=1.0):
+    """Decorator retrying an upload on rate limiting (429) and server errors with exponential backoff"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return func(*args, **kwargs)
+                except (googleapiclient.errors.HttpError, ClientError) as e:
+                    # HttpError carries the HTTP response, the Instagram errors only the status code
+                    response = getattr(e, "resp", None)
+                    status = response.status if response is not None else getattr(e, "code", None)
+                    if status not in TRANSIENT_HTTP_STATUSES or attempt == max_attempts:
+                        raise
+
+                    # Honor the server's Retry-After on rate limiting, otherwise back off with jitter
+                    retry_after = response.get("retry-after") if response is not None else None
+                    if retry_after and retry_after.isdigit():
+                        delay = int(retry_after)
+                    else:
+                        delay = base_delay * 2 ** (attempt - 1) + random.uniform(0, 1)
+                    logger.warning(f"{func.__name__} failed with HTTP {status}, retrying in {delay:.1f}s "
+                                   f"(attempt {attempt}/{max_attempts})")
+                    time.sleep(delay)
+        return wrapper
+    return decorator
+
+
+@retry_on_transient()
+def upload_youtube_video(request, file_path):
+    """Send a resumable YouTube upload chunk by chunk (a retry resumes after the last sent chunk)"""
+    response = None
+    while response is None:
+        status, response = request.next_chunk(num_retries=3)
+        if status:
+            logger.info(f"Uploaded {int(status.progress() * 100)}% of {file_path}")
+    return response
+
+
+@retry_on_transient()
+def upload_instagram_reel(client, file_path, caption):
+    """Upload a video as an Instagram reel"""
+    return client.post_video(file_path, caption, to_reel=True)
+
+
 def post_to_youtube(channel_id, file_path, title, description="", is_short=False, config=None):
     """Post a video to YouTube using the YouTube API"""
     youtube = initialize_youtube_client(channel_id, config)
@@ -1824,24 +1677,25 @@ def post_to_youtube(channel_id, file_path, title, description="", is_short=False
 
         # For shorts, add special tags
         if is_short:
-            body["snippet"]["tags"] = ["#shorts"]
+            body["snippet"]["tags"] = YOUTUBE_SHORTS_TAGS
 
         logger.info(f"Uploading video to YouTube: {title}")
         logger.info(f"File: {file_path}")
 
-        # Create upload request
+        # Create upload request (sent in chunks, so a failed chunk is retried on its own)
         media = MediaFileUpload(file_path,
                                 mimetype="video/mp4",
+                                chunksize=YOUTUBE_UPLOAD_CHUNK_SIZE,
                                 resumable=True)
 
         # Execute the upload request
         request = youtube.videos().insert(
-            part=",".join(body.keys()),
+            part=YOUTUBE_UPLOAD_PARTS,
             body=body,
             media_body=media
         )
 
-        response = request.execute()
+        response = upload_youtube_video(request, file_path)
 
         # Create response object
         result = {
@@ -1879,7 +1733,17 @@ def post_to_instagram(account_id, file_path, title, description="", config=None)
         caption = f"{description}\n\n{title}"
 
         # Upload video as reel
-        result = client.post_video(file_path, caption, to_reel=True)
+        try:
+            result = upload_instagram_reel(client, file_path, caption)
+        except (ClientCookieExpiredError, ClientLoginRequiredError):
+            # The server revoked the session: forget it, log in again and retry once
+            logger.info(f"Instagram session for {account_id} was revoked, logging in again")
+            instagram_clients.pop(account_id, None)
+            discard_instagram_settings(account_id)
+            client = initialize_instagram_client(account_id, config)
+            if not client:
+                raise
+            result = upload_instagram_reel(client, file_path, caption)
 
         media_id = result.get("media", {}).get("id", "unknown")
         code = result.get("media", {}).get("code", "unknown")
@@ -1904,8 +1768,196 @@ def post_to_instagram(account_id, file_path, title, description="", config=None)
         }
 
 
+@lru_cache(maxsize=None)
+def scheduler_client():
+    """EventBridge Scheduler client, only created when posts are handed off to it"""
+    return boto3.client('scheduler')
+
+
+def publish_post(platform, content_type, channel_id, account_id, file_info, post_data, config, tracking_data):
+    """Upload a rendered video to its platform and record the outcome in its tracked post
+
+    The tracker is written afterwards unless tracking_data is None (the caller records the outcome itself).
+    """
+    try:
+        post_data["actual_time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        logger.info(f"\n{LOG_BANNER}")
+        logger.info(f"POSTING {content_type.upper()} ON {platform.upper()} AT {post_data['actual_time']}")
+        logger.info(LOG_BANNER)
+        logger.info(f"  Title: {file_info.get('title', 'Unknown')}")
+        logger.info(f"  File: {file_info.get('path', 'Unknown')}")
+
+        response = None
+
+        # Call the appropriate posting function based on platform and content type
+        if platform.lower() == "youtube":
+            description = file_info.get("description", "")
+            is_short = content_type.lower() == "short"
+            with upload_locks.setdefault(("youtube", channel_id), threading.Lock()):
+                response = post_to_youtube(channel_id, file_info.get("path"),
+                                           file_info.get("title"), description, is_short, config)
+
+        elif platform.lower() == "instagram":
+            description = file_info.get("description", "")
+            with upload_locks.setdefault(("instagram", account_id), threading.Lock()):
+                response = post_to_instagram(account_id, file_info.get("path"),
+                                             file_info.get("title"), description, config)
+
+        # Update tracking data with response
+        with tracking_lock:
+            if response:
+                post_data["status"] = response.get("status", "unknown")
+                if response.get("status") == "success":
+                    post_data["post_id"] = response.get("video_id", response.get("media_id", "unknown"))
+                    post_data["post_url"] = response.get("url", "")
+
+                    logger.info(f"\nPosting successful!")
+                    logger.info(f"  Platform: {response.get('platform')}")
+                    logger.info(f"  ID: {post_data['post_id']}")
+                    logger.info(f"  URL: {post_data['post_url']}")
+                else:
+                    post_data["error"] = response.get("message", "Unknown error")
+                    logger.error(f"\nPosting failed: {post_data['error']}")
+            else:
+                post_data["status"] = "error"
+                post_data["error"] = "No response from posting function"
+                logger.error("\nPosting failed: No response from posting function.")
+
+            # Update tracking data
+            if tracking_data is not None:
+                update_tracking_data(tracking_data)
+
+        logger.info(LOG_BANNER)
+    except Exception as e:
+        logger.error(f"Error in post_job: {e}")
+        with tracking_lock:
+            post_data["status"] = "error"
+            post_data["error"] = str(e)
+            if tracking_data is not None:
+                update_tracking_data(tracking_data)
+
+
+def schedule_post_with_eventbridge(platform, content_type, channel_id, account_id, file_info, post_data,
+                                   post_datetime):
+    """Stage the video in S3 and create a one-time EventBridge schedule that publishes it at post time"""
+    # Day keys repeat every cycle, so a random suffix keeps the name free even if an old schedule
+    # could not be deleted (names are limited to 64 characters)
+    schedule_name = f"{post_data['day']}-{channel_id}-{platform}-{content_type}-{file_info.get('clip_id')}"
+    schedule_name = f"{re.sub(r'[^0-9A-Za-z_.-]', '-', schedule_name)[:55]}-{uuid.uuid4().hex[:8]}"
+    video_key = f"{SCHEDULED_VIDEOS_PREFIX}{os.path.basename(file_info['path'])}"
+
+    # The invocation that publishes the post runs later, possibly on another container
+    if not upload_file_to_s3(file_info["path"], POST_SCHEDULER_BUCKET, video_key):
+        return False
+
+    post_data["schedule_name"] = schedule_name
+    payload = {
+        "platform": platform,
+        "content_type": content_type,
+        "channel_id": channel_id,
+        "account_id": account_id,
+        "schedule_name": schedule_name,
+        "video_key": video_key,
+        "file_info": {key: file_info.get(key) for key in ("title", "description", "clip_id")}
+    }
+
+    try:
+        scheduler_client().create_schedule(
+            Name=schedule_name,
+            GroupName=POST_SCHEDULER_GROUP,
+            ScheduleExpression=f"at({post_datetime.strftime('%Y-%m-%dT%H:%M:%S')})",
+            ScheduleExpressionTimezone=POST_SCHEDULER_TIMEZONE,
+            FlexibleTimeWindow={"Mode": "OFF"},
+            Target={
+                "Arn": POST_SCHEDULER_TARGET_ARN,
+                "RoleArn": POST_SCHEDULER_ROLE_ARN,
+                "Input": json.dumps({"post_data": payload})
+            }
+        )
+    except Exception as e:
+        logger.error(f"Error creating EventBridge schedule {schedule_name}: {e}")
+        # Nothing will ever publish the staged video, so don't leave it behind (the local copy is kept)
+        try:
+            s3_client.delete_object(Bucket=POST_SCHEDULER_BUCKET, Key=video_key)
+        except Exception as e:
+            logger.warning(f"Could not delete staged video {video_key}: {e}")
+        return False
+    logger.info(f"Created EventBridge schedule {schedule_name} for {post_datetime}")
+
+    # The local copy isn't needed once the schedule exists
+    os.remove(file_info["path"])
+    return True
+
+
+def publish_scheduled_post(payload):
+    """Publish a post handed back by EventBridge Scheduler at its post time"""
+    setup_directories()
+    prefetch_json_from_s3()
+    config = load_config_from_s3()
+
+    # Outcome of the post, merged into the tracked post once it is known
+    post_data = {"platform": payload["platform"], "content_type": payload["content_type"],
+                 "channel_id": payload["channel_id"], "schedule_name": payload["schedule_name"],
+                 "status": "scheduled"}
+
+    # Fetch the rendered video staged in S3
+    file_info = dict(payload["file_info"])
+    file_info["path"] = os.path.join(OUTPUT_DIR, os.path.basename(payload["video_key"]))
+    if not download_file_from_s3(POST_SCHEDULER_BUCKET, payload["video_key"], file_info["path"]):
+        post_data["status"] = "error"
+        post_data["error"] = "Rendered video not found in S3"
+        record_scheduled_post(post_data)
+        return {"statusCode": 500, "body": post_data["error"]}
+
+    try:
+        publish_post(payload["platform"], payload["content_type"], payload["channel_id"], payload["account_id"],
+                     file_info, post_data, config, None)
+    finally:
+        os.remove(file_info["path"])
+    record_scheduled_post(post_data)
+
+    # The staged video is only kept for a failed post (to publish it by hand)
+    if post_data["status"] == "success":
+        try:
+            s3_client.delete_object(Bucket=POST_SCHEDULER_BUCKET, Key=payload["video_key"])
+        except Exception as e:
+            logger.warning(f"Could not delete staged video {payload['video_key']}: {e}")
+
+    # One-time schedules stay around after firing, remove this one
+    try:
+        scheduler_client().delete_schedule(Name=payload["schedule_name"], GroupName=POST_SCHEDULER_GROUP)
+    except Exception as e:
+        logger.warning(f"Could not delete schedule {payload['schedule_name']}: {e}")
+
+    return {"statusCode": 200, "body": f"Post {payload['schedule_name']}: {post_data['status']}"}
+
+
+def record_scheduled_post(post_data):
+    """Merge the outcome of a scheduled post into a fresh copy of the tracker and write it
+
+    The tracker is re-read right before the write, so progress a running day recorded since this
+    invocation started isn't overwritten.
+    """
+    with tracking_lock:
+        json_cache.pop((CONFIG_BUCKET, TRACKING_FILE_KEY), None)
+        tracking_data = load_or_create_tracking_data()
+
+        # Find the post recorded when it was scheduled
+        channel_posts = tracking_data.setdefault("posts", {}).setdefault(post_data["channel_id"], [])
+        tracked_post = next((post for post in channel_posts
+                             if post.get("schedule_name") == post_data["schedule_name"]), None)
+        if tracked_post is None:
+            logger.warning(f"No tracked post for schedule {post_data['schedule_name']}, recording it now")
+            channel_posts.append(post_data)
+        else:
+            tracked_post.update(post_data)
+
+        return update_tracking_data(tracking_data, force=True)
+
+
 def schedule_post(platform, content_type, channel_id, account_id, file_info, post_time, config, tracking_data):
-    """Schedule a post for the specified time"""
+    """Schedule a post for the specified time, returning True or the future of the background post (False on error)"""
     # Parse the post time
     try:
         hour, minute = map(int, post_time.split(':'))
@@ -1919,12 +1971,6 @@ def schedule_post(platform, content_type, channel_id, account_id, file_info, pos
         # Calculate delay until post time
         delay_seconds = (post_datetime - current_time).total_seconds()
 
-        # For testing/demo purposes, use a shorter delay
-        if delay_seconds > 300:  # 5 minutes
-            demo_delay = 60  # 1 minute
-            logger.info(f"DEMO MODE: Using {demo_delay}s delay instead of waiting {delay_seconds / 60:.1f} minutes")
-            delay_seconds = demo_delay
-
         # Create post data for tracking
         post_data = {
             "platform": platform,
@@ -1939,79 +1985,68 @@ def schedule_post(platform, content_type, channel_id, account_id, file_info, pos
             "post_id": None,
             "post_url": None,
             "status": "scheduled",
-            "day": tracking_data.get("last_processed_key", "unknown")
+            "day": (tracking_data.get("chunked_processing", {}).get("active_day")
+                    or tracking_data.get("last_processed_key", "unknown"))
         }
 
+        # With EventBridge Scheduler configured, the post is published by a later invocation at
+        # the real post time, so this run doesn't wait for it at all
+        use_eventbridge = bool(POST_SCHEDULER_TARGET_ARN and POST_SCHEDULER_ROLE_ARN)
+        if use_eventbridge:
+            if not schedule_post_with_eventbridge(platform, content_type, channel_id, account_id, file_info,
+                                                  post_data, post_datetime):
+                return False
+        # For testing/demo purposes, use a shorter delay
+        elif delay_seconds > 300:  # 5 minutes
+            demo_delay = 60  # 1 minute
+            logger.info(f"DEMO MODE: Using {demo_delay}s delay instead of waiting {delay_seconds / 60:.1f} minutes")
+            delay_seconds = demo_delay
+
         # Add to tracking data
-        if channel_id not in tracking_data.get("posts", {}):
-            tracking_data["posts"][channel_id] = []
+        with tracking_lock:
+            if channel_id not in tracking_data.get("posts", {}):
+                tracking_data["posts"][channel_id] = []
+
+            tracking_data["posts"][channel_id].append(post_data)
+            # Checkpoint of the active day's run (cleared when a day starts, as day keys repeat every cycle)
+            if "chunked_processing" in tracking_data:
+                tracking_data["chunked_processing"].setdefault("scheduled", []).append(
+                    [channel_id, platform, content_type, file_info.get("clip_id")])
 
-        tracking_data["posts"][channel_id].append(post_data)
-        update_tracking_data(tracking_data)
+            # Written straight away: the recorded post is what keeps a resumed run from making it again
+            update_tracking_data(tracking_data, force=True)
+
+        if use_eventbridge:
+            return True
 
         # Schedule the post
         logger.info(f"Scheduling {platform} {content_type} post for {post_time} " +
                     f"({delay_seconds / 60:.1f} minutes from now)")
 
+        # Set once the post is done (lambda_handler waits for all posts before it returns)
+        post_future = Future()
+
         def post_job():
             try:
-                post_data["actual_time"] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-                logger.info(f"\n{'=' * 50}")
-                logger.info(f"POSTING {content_type.upper()} ON {platform.upper()} AT {post_data['actual_time']}")
-                logger.info(f"{'=' * 50}")
-                logger.info(f"  Title: {file_info.get('title', 'Unknown')}")
-                logger.info(f"  File: {file_info.get('path', 'Unknown')}")
-
-                response = None
-
-                # Call the appropriate posting function based on platform and content type
-                if platform.lower() == "youtube":
-                    description = file_info.get("description", "")
-                    is_short = content_type.lower() == "short"
-                    response = post_to_youtube(channel_id, file_info.get("path"),
-                                               file_info.get("title"), description, is_short, config)
-
-                elif platform.lower() == "instagram":
-                    description = file_info.get("description", "")
-                    response = post_to_instagram(account_id, file_info.get("path"),
-                                                 file_info.get("title"), description, config)
-
-                # Update tracking data with response
-                if response:
-                    post_data["status"] = response.get("status", "unknown")
-                    if response.get("status") == "success":
-                        post_data["post_id"] = response.get("video_id", response.get("media_id", "unknown"))
-                        post_data["post_url"] = response.get("url", "")
-
-                        logger.info(f"\nPosting successful!")
-                        logger.info(f"  Platform: {response.get('platform')}")
-                        logger.info(f"  ID: {post_data['post_id']}")
-                        logger.info(f"  URL: {post_data['post_url']}")
-                    else:
-                        post_data["error"] = response.get("message", "Unknown error")
-                        logger.error(f"\nPosting failed: {post_data['error']}")
-                else:
-                    post_data["status"] = "error"
-                    post_data["error"] = "No response from posting function"
-                    logger.error("\nPosting failed: No response from posting function.")
+                publish_post(platform, content_type, channel_id, account_id, file_info, post_data, config,
+                             tracking_data)
+                os.remove(file_info["path"])
+            finally:
+                post_future.set_result(None)
 
-                # Update tracking data
-                update_tracking_data(tracking_data)
-
-                logger.info(f"{'=' * 50}")
+        def start_post():
+            try:
+                post_executor.submit(post_job)
             except Exception as e:
-                logger.error(f"Error in post_job: {e}")
-                post_data["status"] = "error"
-                post_data["error"] = str(e)
-                update_tracking_data(tracking_data)
-
-        # For AWS Lambda, we need to handle scheduling differently since the
-        # process will terminate after execution. Using a delay here.
-        time.sleep(delay_seconds)
-        post_job()
-
-        return True
+                logger.error(f"Error starting post: {e}")
+                post_future.set_result(None)
+
+        # For AWS Lambda, we need to handle scheduling differently since the process will terminate
+        # after execution. A timer waits out the delay in the background (no post worker is held
+        # while waiting, so posts queued behind others still go out on time) while the remaining
+        # channels are processed
+        threading.Timer(delay_seconds, start_post).start()
+        return post_future
     except Exception as e:
         logger.error(f"Error scheduling post: {e}")
-        return False
\ No newline at end of file
+        return False
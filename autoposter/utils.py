@@ -11,9 +11,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger('social_media_autoposter_utils')
 
+# Created once at import (boto3 clients are thread-safe and reused across invocations)
+s3_client = boto3.client('s3')
+
 def init_s3_client():
-    """Initialize and return an S3 client"""
-    return boto3.client('s3')
+    """Return the shared S3 client"""
+    return s3_client
 
 def create_temp_directories(temp_dir, output_dir, download_dir):
     """Create necessary directories for processing"""